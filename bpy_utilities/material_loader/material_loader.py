@@ -4,6 +4,7 @@ from typing import Dict, Type, Any, Union
 
 from .shader_base import ShaderBase
 from ..logging import BPYLoggingManager
+from ...source_shared.content_manager import ContentManager
 from ...goldsrc.mdl.structs.texture import StudioTexture
 from ...source1.vmt.valve_material import VMT
 
@@ -35,18 +36,26 @@ class Source1MaterialLoader(MaterialLoaderBase):
         print(f'Registered Source1 material handler for {sub.__name__} shader')
         _handlers[sub.SHADER] = sub
 
-    def __init__(self, file_object, material_name):
+    def __init__(self, file_object: Union[VMT, Any], material_name):
         super().__init__(material_name)
         self.material_name: str = material_name[-63:]
-        self.vmt: VMT = VMT(file_object)
+        if isinstance(file_object, VMT):
+            self.vmt: VMT = file_object
+        else:
+            self.vmt: VMT = self.load_vmt(file_object, self.material_name)
+
+    @staticmethod
+    def load_vmt(file_object, material_name='') -> VMT:
+        vmt = VMT(file_object)
         try:
-            self.vmt.parse()
+            vmt.parse()
         except Exception as ex:
             logger.error(f'Failed to load material, due to {ex} error')
             traceback.print_exc()
-            logger.debug(f'Failed material: {self.material_name}:{self.vmt.shader}')
-            self.vmt.shader = 'ERROR'
-            self.vmt.material_data = {}
+            logger.debug(f'Failed material: {material_name}:{vmt.shader}')
+            vmt.shader = 'ERROR'
+            vmt.material_data = {}
+        return vmt
 
     def create_material(self):
         handler: Source1ShaderBase = self._handlers.get(self.vmt.shader, Source1ShaderBase)(self.vmt)
@@ -108,4 +117,7 @@ class Source2MaterialLoader(MaterialLoaderBase):
             logger.error(f'Failed to load material, due to {ex} error')
             traceback.print_exc()
             logger.debug(f'Failed material: {self.material_name}')
+        finally:
+            # Textures prefetched by the shader that it didn't use
+            ContentManager().clear_prefetched()
         handler.align_nodes()
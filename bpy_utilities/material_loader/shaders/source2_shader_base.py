@@ -14,6 +14,7 @@ class Source2ShaderBase(ShaderBase):
         self._material_data: Dict[str, Any] = source2_material
         print(self._material_data)
         self.resources: Dict[Union[str, int], Path] = resources
+        ContentManager().prefetch(path for path in self.resources.values() if path.suffix == '.vtex_c')
 
     def _get_param(self, param_type, name, value_type, default):
         for param in self._material_data[param_type]:
@@ -1,5 +1,8 @@
-import bpy
 import random
+from typing import Union
+
+import bpy
+import numpy as np
 
 
 def get_material(mat_name, model_ob):
@@ -35,3 +38,54 @@ def get_new_unique_collection(model_name, parent_collection):
     master_collection = get_or_create_collection(model_name + (f'_{copy_count}' if copy_count > 0 else ''),
                                                  parent_collection)
     return master_collection
+
+
+def set_object_skin(obj: bpy.types.Object, skin: str):
+    """Switches a Source1 model object to another skin group on object level.
+
+    Objects sharing a mesh, like instanced static props, can use different skins this way.
+    Materials are looked up from the mesh, which always keeps the default skin.
+    """
+    skin_groups = obj['skin_groups']
+    if skin not in skin_groups:
+        return
+    skin_materials = {default_material[-63:]: skin_material[-63:]
+                      for default_material, skin_material in zip(skin_groups['0'], skin_groups[skin])}
+    for slot, mesh_material in zip(obj.material_slots, obj.data.materials):
+        if mesh_material is None or mesh_material.name not in skin_materials:
+            continue
+        material_name = skin_materials[mesh_material.name]
+        slot.link = 'OBJECT'
+        slot.material = bpy.data.materials.get(material_name, None) or bpy.data.materials.new(material_name)
+    obj['active_skin'] = skin
+
+
+def fill_mesh(mesh_data: bpy.types.Mesh, vertices: np.ndarray, loops: np.ndarray,
+              loop_totals: Union[np.ndarray, int]):
+    """Fills an empty mesh from flat buffers, same result as from_pydata without going through Python lists.
+
+    loops holds vertex indices of all polygons back to back, loop_totals is the size of every polygon
+    or a single int when all polygons have the same size.
+    """
+    vertices = np.asarray(vertices, np.float32).reshape((-1, 3))
+    loops = np.asarray(loops, np.int32).ravel()
+    if isinstance(loop_totals, int):
+        loop_totals = np.full(len(loops) // loop_totals, loop_totals, np.int32)
+    else:
+        loop_totals = np.asarray(loop_totals, np.int32)
+
+    mesh_data.vertices.add(len(vertices))
+    mesh_data.vertices.foreach_set('co', vertices.ravel())
+    mesh_data.loops.add(len(loops))
+    mesh_data.loops.foreach_set('vertex_index', loops)
+    mesh_data.polygons.add(len(loop_totals))
+    mesh_data.polygons.foreach_set('loop_start', np.cumsum(loop_totals, dtype=np.int32) - loop_totals)
+    mesh_data.polygons.foreach_set('loop_total', loop_totals)
+    mesh_data.update(calc_edges=True)
+
+
+def add_uv_layer(mesh_data: bpy.types.Mesh, uvs: np.ndarray, name='UVMap'):
+    """Adds uv layer from per-loop uv coordinates."""
+    uv_layer = mesh_data.uv_layers.new(name=name)
+    uv_layer.data.foreach_set('uv', np.asarray(uvs, np.float32).ravel())
+    return uv_layer
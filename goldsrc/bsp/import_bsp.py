@@ -17,7 +17,7 @@ from .lumps.texture_data import TextureDataLump
 from .lumps.texture_info import TextureInfoLump
 from .lumps.vertex_lump import VertexLump
 from ...bpy_utilities.logging import BPYLoggingManager
-from ...bpy_utilities.utils import get_or_create_collection, get_material
+from ...bpy_utilities.utils import get_or_create_collection, get_material, fill_mesh, add_uv_layer
 from ...utilities.math_utilities import parse_hammer_vector, convert_to_radians, HAMMER_UNIT_TO_METERS
 
 log_manager = BPYLoggingManager()
@@ -145,11 +145,6 @@ class BSP:
         unique_vertex_ids = np.unique(vertex_ids)
         material_lookup_table = {}
 
-        remapped = {}
-        for vertex_id in vertex_ids:
-            new_id = np.where(unique_vertex_ids == vertex_id)[0][0]
-            remapped[vertex_id] = new_id
-
         for texture_info_index in used_materials:
             face_texture_info = self.bsp_lump_textures_info.values[texture_info_index]
             face_texture_data = self.bsp_lump_textures_data.values[face_texture_info.texture]
@@ -157,13 +152,11 @@ class BSP:
             material_lookup_table[texture_info_index] = get_material(face_texture_name, model_object)
             self.load_material(face_texture_name)
 
-        uvs_per_face = []
-        faces = []
+        loops = []
+        loop_uvs = []
+        loop_totals = []
         material_indices = []
         for map_face in bsp_faces[entity_model.first_face:entity_model.first_face + entity_model.faces]:
-            uvs = {}
-            face = []
-
             first_edge = map_face.first_edge
             edge_count = map_face.edges
 
@@ -187,23 +180,15 @@ class BSP:
 
             v_uvs = np.dstack([u, v]).reshape((-1, 2))
 
-            for vertex_id, uv in zip(face_vertex_ids, v_uvs):
-                new_vertex_id = remapped[vertex_id]
-                face.append(new_vertex_id)
-                uvs[new_vertex_id] = uv
-            uvs_per_face.append(uvs)
-            faces.append(face[::-1])
+            loops.extend(face_vertex_ids[::-1])
+            loop_uvs.append(v_uvs[::-1])
+            loop_totals.append(len(face_vertex_ids))
 
-        model_mesh.from_pydata(bsp_vertices[unique_vertex_ids] * self.scale, [], faces)
+        loops = np.searchsorted(unique_vertex_ids, np.array(loops, np.uint32))
+        fill_mesh(model_mesh, bsp_vertices[unique_vertex_ids] * self.scale, loops, np.array(loop_totals))
         model_mesh.polygons.foreach_set('material_index', material_indices)
-        model_mesh.update()
-
-        model_mesh.uv_layers.new()
-        model_mesh_uv = model_mesh.uv_layers[0].data
-        for poly in model_mesh.polygons:
-            for loop_index in range(poly.loop_start, poly.loop_start + poly.loop_total):
-                model_mesh_uv[loop_index].uv = uvs_per_face[poly.index][
-                    model_mesh.loops[loop_index].vertex_index]
+
+        add_uv_layer(model_mesh, np.concatenate(loop_uvs))
 
         return model_object
 
@@ -8,7 +8,7 @@ from mathutils import Vector, Matrix, Euler
 from .mdl_file import Mdl
 from .structs.texture import StudioTexture
 from ...bpy_utilities.material_loader.shaders.goldsrc_shaders.goldsrc_shader import GoldSrcShader
-from ...bpy_utilities.utils import get_new_unique_collection, get_material
+from ...bpy_utilities.utils import get_new_unique_collection, get_material, fill_mesh, add_uv_layer
 from ...source_shared.model_container import GoldSrcModelContainer
 
 
@@ -114,9 +114,11 @@ def import_model(mdl_file: BinaryIO, mdl_texture_file: Optional[BinaryIO], scale
             model_materials = []
 
             uv_per_mesh = []
+            uv_scale_per_mesh = []
 
             for model_index, body_part_model_mesh in enumerate(body_part_model.meshes):
                 mesh_texture = mdl_file_textures[body_part_model_mesh.skin_ref]
+                texture_size = (mesh_texture.width, mesh_texture.height)
                 model_materials.extend(np.full(body_part_model_mesh.triangle_count, body_part_model_mesh.skin_ref))
 
                 for mesh_triverts, mesh_triverts_fan in body_part_model_mesh.triangles:
@@ -127,11 +129,8 @@ def import_model(mdl_file: BinaryIO, mdl_texture_file: Optional[BinaryIO], scale
                             v2 = mesh_triverts[index]
 
                             model_indices.append([v0.vertex_index, v1.vertex_index, v2.vertex_index])
-                            uv_per_mesh.append({
-                                v0.vertex_index: (v0.uv[0] / mesh_texture.width, 1 - v0.uv[1] / mesh_texture.height),
-                                v1.vertex_index: (v1.uv[0] / mesh_texture.width, 1 - v1.uv[1] / mesh_texture.height),
-                                v2.vertex_index: (v2.uv[0] / mesh_texture.width, 1 - v2.uv[1] / mesh_texture.height)
-                            })
+                            uv_per_mesh.extend((v0.uv, v1.uv, v2.uv))
+                            uv_scale_per_mesh.extend((texture_size, texture_size, texture_size))
                     else:
                         for index in range(len(mesh_triverts) - 2):
                             v0 = mesh_triverts[index]
@@ -139,25 +138,20 @@ def import_model(mdl_file: BinaryIO, mdl_texture_file: Optional[BinaryIO], scale
                             v2 = mesh_triverts[index + 1 + (index & 1)]
 
                             model_indices.append([v0.vertex_index, v1.vertex_index, v2.vertex_index])
-                            uv_per_mesh.append({
-                                v0.vertex_index: (v0.uv[0] / mesh_texture.width, 1 - v0.uv[1] / mesh_texture.height),
-                                v1.vertex_index: (v1.uv[0] / mesh_texture.width, 1 - v1.uv[1] / mesh_texture.height),
-                                v2.vertex_index: (v2.uv[0] / mesh_texture.width, 1 - v2.uv[1] / mesh_texture.height)
-                            })
+                            uv_per_mesh.extend((v0.uv, v1.uv, v2.uv))
+                            uv_scale_per_mesh.extend((texture_size, texture_size, texture_size))
             remap = {}
             for model_material_index in np.unique(model_materials):
                 model_texture_info = mdl_file_textures[model_material_index]
                 remap[model_material_index] = load_material(model_texture_info, model_object)
 
-            model_mesh.from_pydata(model_vertices, [], model_indices)
-            model_mesh.update()
+            fill_mesh(model_mesh, model_vertices, model_indices, 3)
             model_mesh.polygons.foreach_set('material_index', [remap[a] for a in model_materials])
 
-            model_mesh.uv_layers.new()
-            model_mesh_uv = model_mesh.uv_layers[0].data
-            for poly in model_mesh.polygons:
-                for loop_index in range(poly.loop_start, poly.loop_start + poly.loop_total):
-                    model_mesh_uv[loop_index].uv = uv_per_mesh[poly.index][model_mesh.loops[loop_index].vertex_index]
+            uvs = np.array(uv_per_mesh, np.float32).reshape((-1, 2))
+            uvs /= np.array(uv_scale_per_mesh, np.float32).reshape((-1, 2))
+            uvs[:, 1] = 1 - uvs[:, 1]
+            add_uv_layer(model_mesh, uvs)
 
             mdl_vertex_groups = {}
             for vertex_index, vertex_info in enumerate(body_part_model.bone_vertex_info):
@@ -14,7 +14,6 @@ from ...utilities.byte_io_mdl import ByteIO
 class Mdl(Base):
 
     def __init__(self, filepath):
-        self.store_value("MDL", self)
         self.reader = ByteIO(filepath)
         self.header = StudioHeader()
         self.bones: List[StudioBone] = []
@@ -3,11 +3,11 @@ from pathlib import Path
 
 import bpy
 
-from .bpy_utilities.utils import get_or_create_collection, get_new_unique_collection
-from .source1.mdl.import_mdl import import_model, import_materials, put_into_collections
+from .bpy_utilities.utils import get_or_create_collection, get_new_unique_collection, set_object_skin
+from .source1.mdl.import_mdl import import_model, import_materials, put_into_collections, load_model_cm
 from .source2.resouce_types.valve_model import ValveCompiledModel
 from .source_shared.content_manager import ContentManager
-from .utilities.path_utilities import backwalk_file_resolver, find_vtx_cm
+from .utilities.path_utilities import backwalk_file_resolver
 
 
 def get_parent(collection):
@@ -64,11 +64,9 @@ class LoadEntity_OT_operator(bpy.types.Operator):
                         self.report({'INFO'}, f"Model '{custom_prop_data['prop_path']}_c' not found!")
                 elif model_type == '.mdl':
                     prop_path = Path(custom_prop_data['prop_path'])
-                    mld_file = content_manager.find_file(prop_path)
-                    if mld_file:
-                        vvd_file = content_manager.find_file(prop_path.with_suffix('.vvd'))
-                        vtx_file = find_vtx_cm(prop_path, content_manager)
-                        model_container = import_model(mld_file, vvd_file, vtx_file, 1.0, False, True)
+                    model_files = load_model_cm(prop_path, content_manager, lods=(0,))
+                    if model_files:
+                        model_container = import_model(*model_files, 1.0, False, True)
 
                         entity_data_holder = bpy.data.objects.new(model_container.mdl.header.name, None)
                         entity_data_holder['entity_data'] = {}
@@ -140,6 +138,10 @@ class ChangeSkin_OT_operator(bpy.types.Operator):
         return {'FINISHED'}
 
     def handle_s1(self, obj):
+        if obj.data.users > 1 or any(slot.link == 'OBJECT' for slot in obj.material_slots):
+            # Mesh is shared with other objects (instanced static props), skin has to be set per object
+            set_object_skin(obj, self.skin_name)
+            return
         skin_materials = obj['skin_groups'][self.skin_name]
         current_materials = obj['skin_groups'][obj['active_skin']]
         for skin_material, current_material in zip(skin_materials, current_materials):
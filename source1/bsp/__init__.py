@@ -1 +1 @@
-from .lump import Lump, LumpInfo, LumpTag, lump_tag
+from .lump import Lump, LumpInfo, LumpTag, lump_tag, find_lump_class
@@ -1,6 +1,8 @@
+import mmap
+from concurrent.futures import Future
 from pathlib import Path
 
-from typing import Dict, Type, List
+from typing import Dict, Type, List, Optional, Iterable
 
 from .lump import *
 from .lumps.displacement_lump import DispVert
@@ -25,6 +27,8 @@ from ...bpy_utilities.logging import BPYLoggingManager
 from ...source_shared.content_manager import ContentManager
 
 from ...utilities.byte_io_mdl import ByteIO
+from ...utilities.decompression_pool import get_decompression_pool
+from ...utilities.memory_view_io import MemoryViewIO
 
 log_manager = BPYLoggingManager()
 
@@ -48,8 +52,11 @@ class BSPFile:
         self.reader = ByteIO(self.filepath)
         self.version = 0
         self.lumps_info: List[LumpInfo] = []
-        self.lumps: Dict[str, Lump] = {}
+        self.lumps: Dict[str, Optional[Lump]] = {}
         self.revision = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._data: Optional[memoryview] = None
+        self._preloaded_lumps: Dict[int, Future] = {}
         self.content_manager = ContentManager()
         content_provider = self.content_manager.get_content_provider_from_path(self.filepath)
         self.steam_app_id = content_provider.steam_id
@@ -68,29 +75,87 @@ class BSPFile:
 
         # self.parse_lumps()
 
-    def get_lump(self, lump_name):
+    def get_lump_data(self, lump_info: LumpInfo) -> memoryview:
+        if self._data is None:
+            with open(self.filepath, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = memoryview(self._mmap)
+        return self._data[lump_info.offset:lump_info.offset + lump_info.size]
+
+    def read_lump(self, lump_info: LumpInfo) -> ByteIO:
+        preloaded = self._preloaded_lumps.pop(lump_info.id, None)
+        if preloaded is not None:
+            return preloaded.result()
+        if lump_info.compressed:
+            return self._decompress_lump(self.get_lump_data(lump_info))
+        return ByteIO(MemoryViewIO(self.get_lump_data(lump_info)))
+
+    def preload_lumps(self, lump_names: Iterable[str]):
+        """Starts decompressing given lumps on a thread pool, lzma releases the GIL while it works.
+
+        Only compressed lumps are preloaded, uncompressed ones are cheap to read on first access.
+        """
+        pool = get_decompression_pool()
+        for lump_name in lump_names:
+            resolved = find_lump_class(lump_name, self.version, self.steam_app_id)
+            if resolved is None or resolved[0].lump_id >= len(self.lumps_info):
+                continue
+            lump_info = self.lumps_info[resolved[0].lump_id]
+            if lump_info.size == 0 or not lump_info.compressed or lump_info.id in self._preloaded_lumps:
+                continue
+            if lump_name in self.lumps:
+                continue
+            self._preloaded_lumps[lump_info.id] = pool.submit(self._decompress_lump, self.get_lump_data(lump_info))
+
+    @staticmethod
+    def _decompress_lump(data: memoryview) -> ByteIO:
+        return Lump.decompress_lump(ByteIO(MemoryViewIO(data)))
 
+    def get_lump(self, lump_name):
         if lump_name in self.lumps:
             return self.lumps[lump_name]
-        else:
-            for sub in Lump.all_subclasses():
-                sub: Type[Lump]
-                for dep in sub.tags:
-                    if dep.lump_name == lump_name:
-                        if dep.bsp_version is not None and dep.bsp_version > self.version:
-                            continue
-                        if dep.steam_id is not None and dep.steam_id != self.steam_app_id:
-                            continue
-                        parsed_lump = self.parse_lump(sub, dep.lump_id, dep.lump_name)
-                        self.lumps[lump_name] = parsed_lump
-                        return parsed_lump
+        resolved = find_lump_class(lump_name, self.version, self.steam_app_id)
+        if resolved is None:
+            return None
+        tag, lump_class = resolved
+        return self.parse_lump(lump_class, tag.lump_id, lump_name)
 
     def parse_lump(self, lump_class: Type[Lump], lump_id, lump_name):
+        parsed_lump = None
         if self.lumps_info[lump_id].size != 0:
-            lump = self.lumps_info[lump_id]
             parsed_lump = lump_class(self, lump_id).parse()
-            self.lumps[lump_id] = parsed_lump
-            return parsed_lump
+        self.lumps[lump_name] = parsed_lump
+        return parsed_lump
+
+    def release_lumps(self, *lump_names):
+        """Drops parsed lumps and their data, all lumps if no names are given.
+
+        Released lumps are parsed again if they are requested later.
+        """
+        for lump_name in lump_names or list(self.lumps.keys()):
+            lump = self.lumps.pop(lump_name, None)
+            if lump is not None:
+                lump.release()
+
+    def close(self):
+        """Releases parsed lumps, pending preloads, the memory map and the file handle of the BSP."""
+        for future in self._preloaded_lumps.values():
+            if not future.cancel():
+                # Running decompression holds a view of the map, wait for it to let go
+                future.exception()
+        self._preloaded_lumps.clear()
+        self.release_lumps()
+        if self._data is not None:
+            self._data.release()
+            self._data = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Some lump data is still referenced, the map is unmapped once it's collected
+                pass
+            self._mmap = None
+        self.reader.file.close()
 
 
 class RespawnBSPFile(BSPFile):
@@ -2,66 +2,22 @@ from typing import List
 
 import numpy as np
 
-from .primitive import Primitive
+from .primitive import RecordPrimitive
 from ....utilities.byte_io_mdl import ByteIO
 
 DISP_INFO_FLAG_HAS_MULTIBLEND = 0x40000000
 DISP_INFO_FLAG_MAGIC = 0x80000000
 
 
-class DispInfo(Primitive):
-    def __init__(self, lump, bsp):
-        super().__init__(lump, bsp)
-        self.start_position = []
-        self.disp_vert_start = 0
-        self.disp_tri_start = 0
-        self.power = 0
-        self.min_tess = 0
-        self.smoothing_angle = .0
-        self.contents = 0
-        self.map_face = 0
-        self.lightmap_alpha_start = 0
-        self.lightmap_sample_position_start = 0
-        self.displace_neighbors = []  # type: List[DispNeighbor]
-        self.displace_corner_neighbors = []  # type: List[DisplaceCornerNeighbors]
-        self.allowed_verts = []  # type: List[int]
-        self.has_multiblend = False
-
-    def parse(self, reader: ByteIO):
-        self.start_position = np.array(reader.read_fmt('3f'))
-        (self.disp_vert_start,
-         self.disp_tri_start,
-         self.power,
-         self.min_tess,
-         self.smoothing_angle,
-         self.contents,
-         self.map_face,
-         self.lightmap_alpha_start,
-         self.lightmap_sample_position_start,) = reader.read_fmt('<4IfIH2I')
-        self.has_multiblend = ((self.min_tess + DISP_INFO_FLAG_MAGIC) & DISP_INFO_FLAG_HAS_MULTIBLEND) != 0
-
-        for _ in range(4):
-            disp_neighbor = DispNeighbor()
-            disp_neighbor.read(reader)
-            self.displace_neighbors.append(disp_neighbor)
-        for _ in range(4):
-            displace_corner_neighbors = DisplaceCornerNeighbors()
-            displace_corner_neighbors.read(reader)
-            self.displace_corner_neighbors.append(displace_corner_neighbors)
-        reader.skip(6)
-        self.allowed_verts = [reader.read_int32() for _ in range(10)]
-        return self
-
-    @property
-    def source_face(self):
-        from ..lumps.face_lump import FaceLump
-        lump: FaceLump = self._bsp.get_lump('LUMP_FACES')
-        if lump:
-            return lump.faces[self.map_face]
-        return None
-
-
 class DispSubNeighbor:
+    dtype = np.dtype([
+        ('neighbor', np.uint16),
+        ('neighbor_orientation', np.uint8),
+        ('span', np.uint8),
+        ('padding', np.uint8),
+        ('neighbor_span', np.uint8),
+    ])
+
     def __init__(self):
         self.neighbor = 0
         self.neighbor_orientation = 0
@@ -75,6 +31,12 @@ class DispSubNeighbor:
          self.neighbor_span,) = reader.read_fmt('H2BxB')
         return self
 
+    @classmethod
+    def from_record(cls, record: np.void):
+        self = cls()
+        self.neighbor, self.neighbor_orientation, self.span, _, self.neighbor_span = record.item()
+        return self
+
 
 class DispNeighbor:
     def __init__(self):
@@ -85,6 +47,11 @@ class DispNeighbor:
 
 
 class DisplaceCornerNeighbors:
+    dtype = np.dtype([
+        ('neighbor_indices', np.uint16, (4,)),
+        ('neighbor_count', np.uint8),
+    ])
+
     def __init__(self):
         self.neighbor_indices = [None] * 4  # type: List[int]
         self.neighbor_count = 0
@@ -92,3 +59,54 @@ class DisplaceCornerNeighbors:
     def read(self, reader: ByteIO):
         self.neighbor_indices = reader.read_fmt('4H')
         self.neighbor_count = reader.read_uint8()
+
+    @classmethod
+    def from_record(cls, record: np.void):
+        self = cls()
+        self.neighbor_indices = tuple(record['neighbor_indices'].tolist())
+        self.neighbor_count = int(record['neighbor_count'])
+        return self
+
+
+class DispInfo(RecordPrimitive):
+    dtype = np.dtype([
+        ('start_position', np.float32, (3,)),
+        ('disp_vert_start', np.uint32),
+        ('disp_tri_start', np.uint32),
+        ('power', np.uint32),
+        ('min_tess', np.uint32),
+        ('smoothing_angle', np.float32),
+        ('contents', np.uint32),
+        ('map_face', np.uint16),
+        ('lightmap_alpha_start', np.uint32),
+        ('lightmap_sample_position_start', np.uint32),
+        ('neighbors', DispSubNeighbor.dtype, (4, 2)),
+        ('corner_neighbors', DisplaceCornerNeighbors.dtype, (4,)),
+        ('padding', np.uint8, (6,)),
+        ('allowed_verts', np.int32, (10,)),
+    ])
+
+    @property
+    def has_multiblend(self):
+        return ((self.min_tess + DISP_INFO_FLAG_MAGIC) & DISP_INFO_FLAG_HAS_MULTIBLEND) != 0
+
+    @property
+    def displace_neighbors(self):
+        neighbors = []
+        for sub_neighbors in self._record['neighbors']:
+            disp_neighbor = DispNeighbor()
+            disp_neighbor.sub_neighbors = [DispSubNeighbor.from_record(sub_neighbor) for sub_neighbor in sub_neighbors]
+            neighbors.append(disp_neighbor)
+        return neighbors
+
+    @property
+    def displace_corner_neighbors(self):
+        return [DisplaceCornerNeighbors.from_record(corner) for corner in self._record['corner_neighbors']]
+
+    @property
+    def source_face(self):
+        from ..lumps.face_lump import FaceLump
+        lump: FaceLump = self._bsp.get_lump('LUMP_FACES')
+        if lump:
+            return lump.faces[self.map_face]
+        return None
@@ -1,73 +1,54 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
-from .....utilities.byte_io_mdl import ByteIO
-
-
-class StaticProp:
-    def __init__(self):
-        self.origin = []
-        self.rotation = []
-        self.prop_type = 0
-        self.first_leaf = 0
-        self.leaf_count = 0
-        self.solid = 0
-        self.flags = 0
-        self.skin = 0
-        self.fade_min_dist = 0.0
-        self.fade_max_dist = 0.0
-        self.lighting_origin = []
-
-        self.forced_fade_scale = 0.0
+import numpy as np
 
-        self.min_dx_level = 0
-        self.max_dx_level = 0
-
-        self.min_cpu_level = 0
-        self.max_cpu_level = 0
-        self.min_gpu_level = 0
-        self.max_gpu_level = 0
-
-        self.diffuse_modulation = []
-        self.disable_x360 = 0
-        self.flags_ex = 0
-        self.uniform_scale = 0.0
-
-        self.unk_vector = []
+from .....utilities.byte_io_mdl import ByteIO
 
-    def parse(self, reader: ByteIO, version: int):
-        if version == 12:
-            self.origin = reader.read_fmt('3f')
-            self.rotation = reader.read_fmt('3f')
-            self.prop_type = reader.read_int16()
-            reader.skip(4 + 2)
-            self.skin = reader.read_int32()
-            reader.skip(12 * 4)
-            pass
-        else:
-            if version >= 4:
-                self.origin = reader.read_fmt('3f')
-                self.rotation = reader.read_fmt('3f')
-                self.prop_type, self.first_leaf, self.leaf_count = reader.read_fmt('3H')
-                self.solid, self.flags = reader.read_fmt('2B')
-                self.skin = reader.read_int32()
-                self.fade_min_dist, self.fade_max_dist = reader.read_fmt('2f')
 
-                self.lighting_origin = reader.read_fmt('3f')
-            if version >= 5:
-                self.forced_fade_scale = reader.read_float()
-            if version in [6, 7]:
-                self.min_dx_level, self.max_dx_level = reader.read_fmt('2H')
-            if version >= 8:
-                self.min_cpu_level, self.max_cpu_level, self.min_gpu_level, self.max_gpu_level = reader.read_fmt('4B')
-            if version >= 7:
-                self.diffuse_modulation = reader.read_fmt('4B')
-            if version in [9, 10]:
-                self.disable_x360 = reader.read_uint32()
-            if version > 10:
-                self.flags_ex = reader.read_uint32()
-            if version >= 11:
-                reader.skip(4)
-                self.uniform_scale = reader.read_float()
+@lru_cache(16)
+def static_prop_dtype(version: int) -> Optional[np.dtype]:
+    """Record layout of a static prop for the given game lump version, None for unsupported versions."""
+    if version == 12:
+        return np.dtype([
+            ('origin', np.float32, (3,)),
+            ('rotation', np.float32, (3,)),
+            ('prop_type', np.int16),
+            ('_unk0', np.uint8, (6,)),
+            ('skin', np.int32),
+            ('_unk1', np.uint8, (48,)),
+        ])
+    if version < 4:
+        return None
+    fields = [
+        ('origin', np.float32, (3,)),
+        ('rotation', np.float32, (3,)),
+        ('prop_type', np.uint16),
+        ('first_leaf', np.uint16),
+        ('leaf_count', np.uint16),
+        ('solid', np.uint8),
+        ('flags', np.uint8),
+        ('skin', np.int32),
+        ('fade_min_dist', np.float32),
+        ('fade_max_dist', np.float32),
+        ('lighting_origin', np.float32, (3,)),
+    ]
+    if version >= 5:
+        fields.append(('forced_fade_scale', np.float32))
+    if version in [6, 7]:
+        fields.extend([('min_dx_level', np.uint16), ('max_dx_level', np.uint16)])
+    if version >= 8:
+        fields.extend([('min_cpu_level', np.uint8), ('max_cpu_level', np.uint8),
+                       ('min_gpu_level', np.uint8), ('max_gpu_level', np.uint8)])
+    if version >= 7:
+        fields.append(('diffuse_modulation', np.uint8, (4,)))
+    if version in [9, 10]:
+        fields.append(('disable_x360', np.uint32))
+    if version > 10:
+        fields.append(('flags_ex', np.uint32))
+    if version >= 11:
+        fields.extend([('_unk0', np.uint32), ('uniform_scale', np.float32)])
+    return np.dtype(fields)
 
 
 class StaticPropLump:
@@ -75,19 +56,21 @@ class StaticPropLump:
         from ..game_lump_header import GameLumpHeader
         self._glump_info: GameLumpHeader = glump_info
         self.model_names: List[str] = []
-        self.leafs: List[int] = []
-        self.static_props: List[StaticProp] = []
+        self.leafs: np.ndarray = np.zeros(0, np.uint16)
+        self.static_props: np.ndarray = np.zeros(0, static_prop_dtype(12))
 
     def parse(self, reader: ByteIO):
-        for _ in range(reader.read_int32()):
-            self.model_names.append(reader.read_ascii_string(128))
-        for _ in range(reader.read_int32()):
-            self.leafs.append(reader.read_uint16())
+        name_count = reader.read_int32()
+        names = reader.read(name_count * 128)
+        for offset in range(0, len(names), 128):
+            name = names[offset:offset + 128].strip(b'\x00').split(b'\x00', 1)[0]
+            self.model_names.append(name.decode('latin', errors='replace').strip())
+        leaf_count = reader.read_int32()
+        self.leafs = np.frombuffer(reader.read(leaf_count * 2), np.uint16)
         if self._glump_info.version == 12:
             unk1 = reader.read_int32()
             unk2 = reader.read_int32()
         prop_count = reader.read_int32()
-        for i in range(prop_count):
-            prop = StaticProp()
-            prop.parse(reader, self._glump_info.version)
-            self.static_props.append(prop)
+        prop_dtype = static_prop_dtype(self._glump_info.version)
+        if prop_dtype is not None:
+            self.static_props = np.frombuffer(reader.read(prop_count * prop_dtype.itemsize), prop_dtype)
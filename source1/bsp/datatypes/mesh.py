@@ -1,7 +1,8 @@
 from enum import IntEnum
 
-from .primitive import Primitive
-from ....utilities.byte_io_mdl import ByteIO
+import numpy as np
+
+from .primitive import RecordPrimitive
 
 
 class VertexType(IntEnum):
@@ -11,34 +12,20 @@ class VertexType(IntEnum):
     UNLIT_TS = 3
 
 
-class Mesh(Primitive):
-    def __init__(self, lump, bsp):
-        super().__init__(lump, bsp)
-        self.triangle_start = 0
-        self.triangle_count = 0
-        self.unk1_offset = 0
-        self.unk1_count = 0
-        self.unk2 = 0
-        self.unk3 = 0
-        self.unk4 = 0
-        self.unk5 = 0
-        self.unk6 = 0
-        self.material_sort = 0
-        self.flags = 0
-
-    def parse(self, reader: ByteIO):
-        self.triangle_start = reader.read_uint32()  # 0-4
-        self.triangle_count = reader.read_uint16()  # 4-6
-        self.unk1_offset = reader.read_uint16()
-        self.unk1_count = reader.read_uint16()
-        self.unk2 = reader.read_uint16()
-        self.unk3 = reader.read_uint32()
-        self.unk4 = reader.read_uint16()
-        self.unk5 = reader.read_uint16()
-        self.unk6 = reader.read_uint16()
-        self.material_sort = reader.read_uint16()  # 22-24
-        self.flags = reader.read_uint32()  # 24-28
-        return self
+class Mesh(RecordPrimitive):
+    dtype = np.dtype([
+        ('triangle_start', np.uint32),  # 0-4
+        ('triangle_count', np.uint16),  # 4-6
+        ('unk1_offset', np.uint16),
+        ('unk1_count', np.uint16),
+        ('unk2', np.uint16),
+        ('unk3', np.uint32),
+        ('unk4', np.uint16),
+        ('unk5', np.uint16),
+        ('unk6', np.uint16),
+        ('material_sort', np.uint16),  # 22-24
+        ('flags', np.uint32),  # 24-28
+    ])
 
     @property
     def vertex_type(self):
@@ -1,26 +1,18 @@
-from .primitive import Primitive
-from ..lumps.node_lump import NodeLump
-from ....utilities.byte_io_mdl import ByteIO
+import numpy as np
 
+from .primitive import RecordPrimitive
+from ..lumps.node_lump import NodeLump
 
-class Model(Primitive):
-    def __init__(self, lump, bsp):
-        super().__init__(lump, bsp)
-        self.mins = []
-        self.maxs = []
-        self.origin = []
-        self.head_node = 0
-        self.first_face = 0
-        self.face_count = 0
 
-    def parse(self, reader: ByteIO):
-        self.mins = reader.read_fmt('3f')
-        self.maxs = reader.read_fmt('3f')
-        self.origin = reader.read_fmt('3f')
-        self.head_node = reader.read_int32()
-        self.first_face = reader.read_int32()
-        self.face_count = reader.read_int32()
-        return self
+class Model(RecordPrimitive):
+    dtype = np.dtype([
+        ('mins', np.float32, (3,)),
+        ('maxs', np.float32, (3,)),
+        ('origin', np.float32, (3,)),
+        ('head_node', np.int32),
+        ('first_face', np.int32),
+        ('face_count', np.int32),
+    ])
 
     @property
     def node(self):
@@ -31,13 +23,9 @@ class Model(Primitive):
 
 
 class RespawnModel(Model):
-    def __init__(self, lump, bsp):
-        super().__init__(lump, bsp)
-        self.first_mesh = 0
-        self.mesh_count = 0
-
-    def parse(self, reader: ByteIO):
-        self.mins = reader.read_fmt('3f')
-        self.maxs = reader.read_fmt('3f')
-        self.first_mesh, self.mesh_count = reader.read_fmt('2I')
-        return self
\ No newline at end of file
+    dtype = np.dtype([
+        ('mins', np.float32, (3,)),
+        ('maxs', np.float32, (3,)),
+        ('first_mesh', np.uint32),
+        ('mesh_count', np.uint32),
+    ])
@@ -1,30 +1,20 @@
-from typing import List
+import numpy as np
 
-from .primitive import Primitive
+from .primitive import RecordPrimitive
 from ..lumps.plane_lump import PlaneLump
 
-from ....utilities.byte_io_mdl import ByteIO
 
-
-class Node(Primitive):
-    def __init__(self, lump, bsp):
-        super().__init__(lump, bsp)
-        self.plane_index = 0
-        self.childes_id: List[int] = []
-        self.min = []
-        self.max = []
-        self.first_face = 0
-        self.face_count = 0
-        self.area = 0
-
-    def parse(self, reader: ByteIO):
-        self.plane_index = reader.read_int32()
-        self.childes_id = reader.read_fmt('2i')
-        self.min = reader.read_fmt('3h')
-        self.max = reader.read_fmt('3h')
-        self.first_face, self.face_count, self.area = reader.read_fmt('3hxx')
-
-        return self
+class Node(RecordPrimitive):
+    dtype = np.dtype([
+        ('plane_index', np.int32),
+        ('childes_id', np.int32, (2,)),
+        ('min', np.int16, (3,)),
+        ('max', np.int16, (3,)),
+        ('first_face', np.int16),
+        ('face_count', np.int16),
+        ('area', np.int16),
+        ('padding', np.int16),
+    ])
 
     @property
     def plane(self):
@@ -1,3 +1,7 @@
+from typing import Sequence, Type
+
+import numpy as np
+
 
 class Primitive:
     def __init__(self, lump, bsp):
@@ -5,3 +9,49 @@ class Primitive:
         from ..bsp_file import BSPFile
         self._lump: Lump = lump
         self._bsp: BSPFile = bsp
+
+
+class RecordPrimitive(Primitive):
+    """Primitive backed by one record of a structured array, every dtype field is readable as an attribute."""
+    dtype: np.dtype = None
+
+    def __init__(self, lump, bsp, record: np.void):
+        super().__init__(lump, bsp)
+        self._record = record
+
+    def __getattr__(self, name):
+        record = self.__dict__.get('_record', None)
+        if record is None or name not in record.dtype.fields:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        value = record[name]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self._record}>'
+
+
+class RecordList(Sequence):
+    """Read-only list of RecordPrimitive views over a structured array, records are wrapped on access."""
+
+    def __init__(self, lump, bsp, record_class: Type[RecordPrimitive], records: np.ndarray):
+        self._lump = lump
+        self._bsp = bsp
+        self.record_class = record_class
+        self.records = records
+
+    @classmethod
+    def from_buffer(cls, lump, bsp, record_class: Type[RecordPrimitive], buffer: bytes):
+        return cls(lump, bsp, record_class, np.frombuffer(buffer, record_class.dtype))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RecordList(self._lump, self._bsp, self.record_class, self.records[index])
+        return self.record_class(self._lump, self._bsp, self.records[index])
+
+    def __iter__(self):
+        record_class, lump, bsp = self.record_class, self._lump, self._bsp
+        for record in self.records:
+            yield record_class(lump, bsp, record)
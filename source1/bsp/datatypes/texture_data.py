@@ -1,27 +1,18 @@
-from .primitive import Primitive
-from ..lumps.string_lump import StringsLump
-from ....utilities.byte_io_mdl import ByteIO
-
+import numpy as np
 
-class TextureData(Primitive):
+from .primitive import RecordPrimitive
+from ..lumps.string_lump import StringsLump
 
-    def __init__(self, lump, bsp):
-        super().__init__(lump, bsp)
-        self.reflectivity = []
-        self.name_id = 0
-        self.width = 0
-        self.height = 0
-        self.view_width = 0
-        self.view_height = 0
 
-    def parse(self, reader: ByteIO):
-        self.reflectivity = reader.read_fmt('3f')
-        self.name_id = reader.read_int32()
-        self.width = reader.read_int32()
-        self.height = reader.read_int32()
-        self.view_width = reader.read_int32()
-        self.view_height = reader.read_int32()
-        return self
+class TextureData(RecordPrimitive):
+    dtype = np.dtype([
+        ('reflectivity', np.float32, (3,)),
+        ('name_id', np.int32),
+        ('width', np.int32),
+        ('height', np.int32),
+        ('view_width', np.int32),
+        ('view_height', np.int32),
+    ])
 
     @property
     def name(self):
@@ -32,12 +23,4 @@ class TextureData(Primitive):
 
 
 class RespawnTextureData(TextureData):
-
-    def __init__(self, lump, bsp):
-        super().__init__(lump, bsp)
-        self.unk1 = 0
-
-    def parse(self, reader: ByteIO):
-        super().parse(reader)
-        self.unk1 = reader.read_int32()
-        return self
+    dtype = np.dtype(TextureData.dtype.descr + [('unk1', np.int32)])
@@ -1,22 +1,15 @@
-from .primitive import Primitive
-from ....utilities.byte_io_mdl import ByteIO
+import numpy as np
 
+from .primitive import RecordPrimitive
 
-class TextureInfo(Primitive):
 
-    def __init__(self, lump, bsp):
-        super().__init__(lump, bsp)
-        self.texture_vectors = []
-        self.lightmap_vectors = []
-        self.flags = 0
-        self.texture_data_id = 0
-
-    def parse(self, reader: ByteIO):
-        self.texture_vectors = [reader.read_fmt('4f'), reader.read_fmt('4f')]
-        self.lightmap_vectors = [reader.read_fmt('4f'), reader.read_fmt('4f')]
-        self.flags = reader.read_int32()
-        self.texture_data_id = reader.read_int32()
-        return self
+class TextureInfo(RecordPrimitive):
+    dtype = np.dtype([
+        ('texture_vectors', np.float32, (2, 4)),
+        ('lightmap_vectors', np.float32, (2, 4)),
+        ('flags', np.int32),
+        ('texture_data_id', np.int32),
+    ])
 
     @property
     def tex_data(self):
@@ -2,7 +2,7 @@ import math
 import re
 from pathlib import Path
 from pprint import pprint
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import numpy as np
 
@@ -15,15 +15,12 @@ from .base_entity_classes import func_door, worldspawn, prop_dynamic, parse_floa
     logic_relay, move_rope, keyframe_rope, trigger_once, path_track, infodecal, prop_physics_multiplayer
 from .base_entity_classes import entity_class_handle as base_entity_classes
 from ..bsp_file import BSPFile
-from ..datatypes.face import Face
 from ..datatypes.model import Model
-from ..datatypes.texture_data import TextureData
-from ..datatypes.texture_info import TextureInfo
 from ...vmt.valve_material import VMT
 from ...vtf.import_vtf import import_texture
 from ....bpy_utilities.logging import BPYLoggingManager
 from ....bpy_utilities.material_loader.material_loader import Source1MaterialLoader
-from ....bpy_utilities.utils import get_material, get_or_create_collection
+from ....bpy_utilities.utils import get_material, get_or_create_collection, fill_mesh, add_uv_layer
 from ....source_shared.content_manager import ContentManager
 from ....utilities.math_utilities import HAMMER_UNIT_TO_METERS, lerp_vec
 
@@ -31,29 +28,38 @@ strip_patch_coordinates = re.compile(r"_-?\d+_-?\d+_-?\d+.*$")
 log_manager = BPYLoggingManager()
 
 
-def gather_vertex_ids(model: Model, faces: List[Face], surf_edges: np.ndarray, edges: np.ndarray):
-    vertex_offset = 0
-    material_ids = []
-    vertex_count = 0
-    for map_face in faces[model.first_face:model.first_face + model.face_count]:
-        vertex_count += map_face.edge_count
-    vertex_ids = np.zeros(vertex_count, dtype=np.uint16)
-    for map_face in faces[model.first_face:model.first_face + model.face_count]:
-        if map_face.disp_info_id != -1:
-            continue
-        first_edge = map_face.first_edge
-        edge_count = map_face.edge_count
-        material_ids.append(map_face.tex_info_id)
+def gather_vertex_ids(model: Model, faces: np.ndarray, surf_edges: np.ndarray, edges: np.ndarray):
+    """Vertex id of every loop of non-displacement faces in model, in Blender winding order.
 
-        used_surf_edges = surf_edges[first_edge:first_edge + edge_count]
-        reverse = np.subtract(1, (used_surf_edges > 0).astype(np.uint8))
-        used_edges = edges[np.abs(used_surf_edges)]
-        tmp = np.arange(len(used_edges))
-        face_vertex_ids = used_edges[tmp, reverse]
-        vertex_ids[vertex_offset:vertex_offset + edge_count] = face_vertex_ids
-        vertex_offset += edge_count
+    Returns (vertex_ids, loop_totals, face_ids), face_ids being indices into faces.
+    """
+    face_ids = np.arange(model.first_face, model.first_face + model.face_count)
+    face_ids = face_ids[faces['disp_info_id'][face_ids] == -1]
+    first_edges = faces['first_edge'][face_ids].astype(np.int64)
+    loop_totals = faces['edge_count'][face_ids].astype(np.int64)
+    loop_starts = np.cumsum(loop_totals) - loop_totals
+    loop_count = int(loop_totals.sum())
 
-    return vertex_ids, material_ids
+    # Faces are stored clockwise, walk each one backwards
+    local_loop_ids = np.arange(loop_count) - np.repeat(loop_starts, loop_totals)
+    surf_edge_ids = np.repeat(first_edges + loop_totals - 1, loop_totals) - local_loop_ids
+    used_surf_edges = surf_edges[surf_edge_ids].astype(np.int64)
+    used_edges = edges[np.abs(used_surf_edges)]
+    vertex_ids = np.where(used_surf_edges > 0, used_edges[:, 0], used_edges[:, 1]).astype(np.uint32)
+    return vertex_ids, loop_totals, face_ids
+
+
+def gather_loop_uvs(vertex_ids: np.ndarray, loop_totals: np.ndarray, tex_info_ids: np.ndarray,
+                    vertices: np.ndarray, textures_info: np.ndarray, textures_data: np.ndarray):
+    loop_tex_info_ids = np.repeat(tex_info_ids, loop_totals)
+    texture_vectors = textures_info['texture_vectors'][loop_tex_info_ids]
+    texture_data = textures_data[textures_info['texture_data_id'][loop_tex_info_ids]]
+    positions = vertices[vertex_ids]
+
+    uvs = np.empty((len(vertex_ids), 2), np.float32)
+    uvs[:, 0] = ((positions * texture_vectors[:, 0, :3]).sum(axis=1) + texture_vectors[:, 0, 3]) / texture_data['width']
+    uvs[:, 1] = 1 - ((positions * texture_vectors[:, 1, :3]).sum(axis=1) + texture_vectors[:, 1, 3]) / texture_data['height']
+    return uvs
 
 
 def _srgb2lin(s: float) -> float:
@@ -73,14 +79,15 @@ class BaseEntityHandler:
         self.scale = world_scale
         self.parent_collection = parent_collection
 
-        self._entites = self._bsp.get_lump('LUMP_ENTITIES').entities
+        entity_lump = self._bsp.get_lump('LUMP_ENTITIES')
+        self._entites = entity_lump.entities
+        self._entities_by_class = entity_lump.entities_by_class
+        self._entities_by_name = entity_lump.entities_by_name
         self._handled_paths = []
-        self._entity_by_name_cache = {}
+        self._collections: Dict[str, bpy.types.Collection] = {}
 
     def _get_entity_by_name(self, name):
-        if not self._entity_by_name_cache:
-            self._entity_by_name_cache = {e['targetname']: e for e in self._entites if 'targetname' in e}
-        entity = self._entity_by_name_cache.get(name, None)
+        entity = self._entities_by_name.get(name, None)
         if entity is None:
             return None, None
         entity_class = self._get_class(entity['classname'])
@@ -95,74 +102,32 @@ class BaseEntityHandler:
         model = self._bsp.get_lump("LUMP_MODELS").models[model_id]
         mesh_obj = bpy.data.objects.new(model_name, bpy.data.meshes.new(f"{model_name}_MESH"))
         mesh_data = mesh_obj.data
-        faces = []
-        material_indices = []
 
         bsp_surf_edges: np.ndarray = self._bsp.get_lump('LUMP_SURFEDGES').surf_edges
         bsp_vertices: np.ndarray = self._bsp.get_lump('LUMP_VERTICES').vertices
         bsp_edges: np.ndarray = self._bsp.get_lump('LUMP_EDGES').edges
-        bsp_faces: List[Face] = self._bsp.get_lump('LUMP_FACES').faces
-        bsp_textures_info: List[TextureInfo] = self._bsp.get_lump('LUMP_TEXINFO').texture_info
-        bsp_textures_data: List[TextureData] = self._bsp.get_lump('LUMP_TEXDATA').texture_data
-
-        vertex_ids, material_ids = gather_vertex_ids(model, bsp_faces, bsp_surf_edges, bsp_edges)
-        unique_vertex_ids = np.unique(vertex_ids)
+        bsp_faces: np.ndarray = self._bsp.get_lump('LUMP_FACES').faces.records
+        bsp_textures_info: np.ndarray = self._bsp.get_lump('LUMP_TEXINFO').texture_info.records
+        bsp_textures_data: np.ndarray = self._bsp.get_lump('LUMP_TEXDATA').texture_data.records
 
-        tmp2 = np.searchsorted(unique_vertex_ids, vertex_ids)
-        remapped = dict(zip(vertex_ids, tmp2))
+        vertex_ids, loop_totals, face_ids = gather_vertex_ids(model, bsp_faces, bsp_surf_edges, bsp_edges)
+        tex_info_ids = bsp_faces['tex_info_id'][face_ids]
+        uvs = gather_loop_uvs(vertex_ids, loop_totals, tex_info_ids, bsp_vertices, bsp_textures_info, bsp_textures_data)
+        unique_vertex_ids, loops = np.unique(vertex_ids, return_inverse=True)
 
+        unique_tex_info_ids, face_tex_info_ids = np.unique(tex_info_ids, return_inverse=True)
         material_lookup_table = {}
-        for texture_info in sorted(set(material_ids)):
-            texture_info = bsp_textures_info[texture_info]
-            texture_data = bsp_textures_data[texture_info.texture_data_id]
-            material_name = self._get_string(texture_data.name_id)
-            material_name = strip_patch_coordinates.sub("", material_name)[-63:]
-            material_lookup_table[texture_data.name_id] = get_material(material_name, mesh_obj)
-
-        uvs_per_face = []
-
-        for map_face in bsp_faces[model.first_face:model.first_face + model.face_count]:
-            if map_face.disp_info_id != -1:
-                continue
-            uvs = {}
-            face = []
-            first_edge = map_face.first_edge
-            edge_count = map_face.edge_count
-
-            texture_info = bsp_textures_info[map_face.tex_info_id]
-            texture_data = bsp_textures_data[texture_info.texture_data_id]
-            tv1, tv2 = texture_info.texture_vectors
-
-            used_surf_edges = bsp_surf_edges[first_edge:first_edge + edge_count]
-            reverse = np.subtract(1, (used_surf_edges > 0).astype(np.uint8))
-            used_edges = bsp_edges[np.abs(used_surf_edges)]
-            tmp = np.arange(len(used_edges))
-            face_vertex_ids = used_edges[tmp, reverse]
-
-            uv_vertices = bsp_vertices[face_vertex_ids]
-
-            u = (np.dot(uv_vertices, tv1[:3]) + tv1[3]) / texture_data.width
-            v = 1 - ((np.dot(uv_vertices, tv2[:3]) + tv2[3]) / texture_data.height)
-
-            v_uvs = np.dstack([u, v]).reshape((-1, 2))
-
-            for vertex_id, uv in zip(face_vertex_ids, v_uvs):
-                new_vertex_id = remapped[vertex_id]
-                face.append(new_vertex_id)
-                uvs[new_vertex_id] = uv
-
-            material_indices.append(material_lookup_table[texture_data.name_id])
-            uvs_per_face.append(uvs)
-            faces.append(face[::-1])
-
-        mesh_data.from_pydata(bsp_vertices[unique_vertex_ids] * self.scale, [], faces)
-        mesh_data.polygons.foreach_set('material_index', material_indices)
-
-        mesh_data.uv_layers.new()
-        uv_data = mesh_data.uv_layers[0].data
-        for poly in mesh_data.polygons:
-            for loop_index in range(poly.loop_start, poly.loop_start + poly.loop_total):
-                uv_data[loop_index].uv = uvs_per_face[poly.index][mesh_data.loops[loop_index].vertex_index]
+        tex_info_materials = np.zeros(len(unique_tex_info_ids), np.int32)
+        for n, tex_info_id in enumerate(unique_tex_info_ids):
+            name_id = int(bsp_textures_data['name_id'][bsp_textures_info['texture_data_id'][tex_info_id]])
+            if name_id not in material_lookup_table:
+                material_name = strip_patch_coordinates.sub("", self._get_string(name_id))[-63:]
+                material_lookup_table[name_id] = get_material(material_name, mesh_obj)
+            tex_info_materials[n] = material_lookup_table[name_id]
+
+        fill_mesh(mesh_data, bsp_vertices[unique_vertex_ids] * self.scale, loops, loop_totals)
+        mesh_data.polygons.foreach_set('material_index', tex_info_materials[face_tex_info_ids])
+        add_uv_layer(mesh_data, uvs)
 
         return mesh_obj
 
@@ -175,9 +140,14 @@ class BaseEntityHandler:
         else:
             return f'{entity.class_name}_{entity.hammer_id}'
 
+    def _get_collection(self, name) -> bpy.types.Collection:
+        collection = self._collections.get(name, None)
+        if collection is None:
+            collection = self._collections[name] = get_or_create_collection(name, self.parent_collection)
+        return collection
+
     def _put_into_collection(self, name, obj):
-        parent_collection = get_or_create_collection(name, self.parent_collection)
-        parent_collection.objects.link(obj)
+        self._get_collection(name).objects.link(obj)
 
     def _apply_light_rotation(self, obj, entity):
         obj.rotation_euler = Euler((0, math.radians(-90), 0))
@@ -283,9 +253,7 @@ class BaseEntityHandler:
         else:
             return Base()
 
-    def resolve_parents(self, entity_raw: dict):
-        entity = self._get_class(entity_raw['classname'])
-        entity.from_dict(entity, entity_raw)
+    def _resolve_parent(self, entity: Base):
         if hasattr(entity, 'targetname') and hasattr(entity, 'parentname'):
             if entity.targetname and str(entity.targetname) in bpy.data.objects:
                 obj = bpy.data.objects[entity.targetname]
@@ -293,29 +261,42 @@ class BaseEntityHandler:
 
     def load_entities(self):
         entity_lump = self._bsp.get_lump('LUMP_ENTITIES')
-        for entity_data in entity_lump.entities:
-            if not self.handle_entity(entity_data):
-                pprint(entity_data)
+        handled_entities = self.handle_entities(entity_lump.entities)
         bpy.context.view_layer.update()
-        for entity_data in entity_lump.entities:
-            self.resolve_parents(entity_data)
-        pass
-
-    def handle_entity(self, entity_data):
-        entity_class = entity_data['classname']
-        if hasattr(self, f'handle_{entity_class}') and entity_class in self.entity_lookup_table:
-            entity_object = self._get_class(entity_class)
+        for entity in handled_entities:
+            self._resolve_parent(entity)
+
+    def _get_handler(self, entity_class: str):
+        if entity_class in self.entity_lookup_table:
+            return getattr(self, f'handle_{entity_class}', None)
+        return None
+
+    def handle_entities(self, entities: List[dict]) -> List[Base]:
+        """Dispatches entities in lump order, handler and entity class are looked up once per classname.
+
+        Lump order is kept so Blender name suffixes, and parents later found by name, do not change.
+        Returns parsed objects of all handled entities.
+        """
+        dispatch_table: Dict[str, Optional[tuple]] = {}
+        handled_entities = []
+        for entity_data in entities:
+            entity_class = entity_data['classname']
+            if entity_class not in dispatch_table:
+                handler_function = self._get_handler(entity_class)
+                if handler_function is None:
+                    dispatch_table[entity_class] = None
+                else:
+                    dispatch_table[entity_class] = self.entity_lookup_table[entity_class], handler_function
+            dispatch = dispatch_table[entity_class]
+            if dispatch is None:
+                pprint(entity_data)
+                continue
+            entity_type, handler_function = dispatch
+            entity_object = entity_type()
             entity_object.from_dict(entity_object, entity_data)
-            handler_function = getattr(self, f'handle_{entity_class}')
-            # try:
             handler_function(entity_object, entity_data)
-            # except Exception as e:
-            #     import traceback
-            #     self.logger.error(f'Exception during handling {entity_class} entity: {e.__class__.__name__}("{e}")')
-            #     self.logger.error(traceback.format_exc())
-            #     return False
-            return True
-        return False
+            handled_entities.append(entity_object)
+        return handled_entities
 
     def handle_func_door(self, entity: func_door, entity_raw: dict):
         model_id = int(entity_raw.get('model')[1:])
@@ -594,10 +575,10 @@ class BaseEntityHandler:
         material_name = entity.RopeMaterial
         get_material(material_name, curve_object)
 
-        material_file = content_manager.find_material(material_name)
-        if material_file:
+        vmt = content_manager.load_asset(material_name, Source1MaterialLoader.load_vmt, 'materials', '.vmt')
+        if vmt:
             material_name = strip_patch_coordinates.sub("", material_name)
-            mat = Source1MaterialLoader(material_file, material_name)
+            mat = Source1MaterialLoader(vmt, material_name)
             mat.create_material()
         self._put_into_collection('move_rope', curve_object)
 
@@ -611,8 +592,8 @@ class BaseEntityHandler:
         while True:
             parent = list(
                 filter(
-                    lambda e: e.get('target', None) == top_parent.targetname and e['classname'] == 'path_track',
-                    self._entites
+                    lambda e: e.get('target', None) == top_parent.targetname,
+                    self._entities_by_class.get('path_track', [])
                 ))
             if parent and parent[0]['targetname'] not in parents:
                 parents.append(parent[0]['targetname'])
@@ -659,10 +640,10 @@ class BaseEntityHandler:
 
     def handle_infodecal(self, entity: infodecal, entity_raw: dict):
         material_name = Path(entity.texture).name
-        material_file = ContentManager().find_material(entity.texture)
-        if material_file:
+        vmt = ContentManager().load_asset(entity.texture, Source1MaterialLoader.load_vmt, 'materials', '.vmt')
+        if vmt:
             material_name = strip_patch_coordinates.sub("", material_name)
-            mat = Source1MaterialLoader(material_file, material_name)
+            mat = Source1MaterialLoader(vmt, material_name)
             mat.create_material()
 
             tex_name = Path(mat.vmt.get_param('$basetexture', None)).name
@@ -685,7 +666,7 @@ class BaseEntityHandler:
         mesh = bpy.data.meshes.new(entity.class_name + str(entity.hammer_id))
         obj = bpy.data.objects.new(entity.class_name + str(entity.hammer_id), mesh)
         mesh_data = obj.data
-        mesh_data.from_pydata(verts, [], [[0, 1, 2, 3]])
+        fill_mesh(mesh_data, verts, [0, 1, 2, 3], 4)
 
         uv_data = mesh_data.uv_layers.new().data
         get_material(material_name, obj)
@@ -1,13 +1,12 @@
 import math
 from collections import defaultdict
 from itertools import chain
-from pprint import pprint
 
 import bpy
 import numpy as np
 from typing import List
 
-from ....bpy_utilities.utils import get_material
+from ....bpy_utilities.utils import get_material, fill_mesh, add_uv_layer
 from ..datatypes.material_sort import MaterialSort
 from ..datatypes.mesh import Mesh, VertexType
 from ..datatypes.model import RespawnModel
@@ -132,33 +131,13 @@ class TitanfallEntityHandler(BaseEntityHandler):
             for mat in material_indices:
                 get_material(mat, mesh_obj)
 
-            unique_vertex_ids = np.unique(merged_vertex_ids)
+            unique_vertex_ids, loops = np.unique(merged_vertex_ids, return_inverse=True)
 
-            tmp2 = np.searchsorted(unique_vertex_ids, merged_vertex_ids)
-            remapped = dict(zip(merged_vertex_ids, tmp2))
-
-            faces = []
-            uvs_per_face = []
-            for triplet, tri_uv, tri_uv_lm in zip(merged_vertex_ids.reshape((-1, 3)),
-                                                  merged_uv_data.reshape((-1, 3, 2)),
-                                                  merged_lightmap_uv_data.reshape((-1, 3, 2))):
-                faces.append((remapped[triplet[0]], remapped[triplet[1]], remapped[triplet[2]]))
-                uvs_per_face.append(
-                    {remapped[triplet[0]]: (tri_uv[0], tri_uv_lm[0]),
-                     remapped[triplet[1]]: (tri_uv[1], tri_uv_lm[1]),
-                     remapped[triplet[2]]: (tri_uv[2], tri_uv_lm[2])})
-
-            mesh_data.from_pydata(bsp_vertices[unique_vertex_ids] * self.scale, [], faces)
+            fill_mesh(mesh_data, bsp_vertices[unique_vertex_ids] * self.scale, loops, 3)
             mesh_data.polygons.foreach_set('material_index', merged_materials_ids)
 
-            mesh_data.uv_layers.new()
-            uv_data = mesh_data.uv_layers[0].data
-            uv_lm_data = mesh_data.uv_layers.new(name='LIGHTMAP').data
-
-            for poly in mesh_data.polygons:
-                for loop_index in range(poly.loop_start, poly.loop_start + poly.loop_total):
-                    uv_data[loop_index].uv = uvs_per_face[poly.index][mesh_data.loops[loop_index].vertex_index][0]
-                    uv_lm_data[loop_index].uv = uvs_per_face[poly.index][mesh_data.loops[loop_index].vertex_index][1]
+            add_uv_layer(mesh_data, merged_uv_data)
+            add_uv_layer(mesh_data, merged_lightmap_uv_data, 'LIGHTMAP')
 
         return objs
 
@@ -201,12 +180,10 @@ class TitanfallEntityHandler(BaseEntityHandler):
     def load_entities(self):
         entity_lump = self._bsp.get_lump('LUMP_ENTITIES')
         additional_entity_lump = self._bsp.get_lump('LUMP_ENTITYPARTITIONS')
-        for entity_data in chain(entity_lump.entities, additional_entity_lump.entities):
-            if not self.handle_entity(entity_data):
-                pprint(entity_data)
+        self.handle_entities(list(chain(entity_lump.entities, additional_entity_lump.entities)))
         # bpy.context.view_layer.update()
-        # for entity_data in entity_lump.entities:
-        #     self.resolve_parents(entity_data)
+        # for entity in handled_entities:
+        #     self._resolve_parent(entity)
         pass
 
     def handle_worldspawn(self, entity: worldspawn, entity_raw: dict):
@@ -2,6 +2,7 @@ import json
 import math
 from mathutils import Vector, Quaternion, Matrix
 import re
+from functools import lru_cache
 from pathlib import Path
 from pprint import pprint
 from typing import Optional, List, Tuple, Dict, Any
@@ -10,6 +11,7 @@ import bpy
 import numpy as np
 
 from .bsp_file import BSPFile, open_bsp
+from .datatypes.displacement import DISP_INFO_FLAG_HAS_MULTIBLEND, DISP_INFO_FLAG_MAGIC
 from .datatypes.gamelumps.static_prop_lump import StaticPropLump
 from .entities.base_entity_handler import BaseEntityHandler
 from .entities.halflife2_entity_handler import HalfLifeEntityHandler
@@ -29,12 +31,13 @@ from .lumps.string_lump import StringsLump
 from .lumps.surf_edge_lump import SurfEdgeLump
 from .lumps.texture_lump import TextureInfoLump, TextureDataLump
 from .lumps.vertex_lump import VertexLump
+from ..mdl.import_mdl import import_model, import_materials, load_model_cm
 from ...bpy_utilities.logging import BPYLoggingManager
 from ...bpy_utilities.material_loader.material_loader import Source1MaterialLoader
-from ...bpy_utilities.utils import get_material, get_or_create_collection
+from ...bpy_utilities.utils import get_material, get_or_create_collection, fill_mesh, add_uv_layer, set_object_skin
 from ...source_shared.content_manager import ContentManager
 from ...utilities.keyvalues import KVParser
-from ...utilities.math_utilities import parse_hammer_vector, convert_rotation_source1_to_blender, lerp_vec, \
+from ...utilities.math_utilities import parse_hammer_vector, lerp_vec, \
     clamp_value, HAMMER_UNIT_TO_METERS
 
 strip_patch_coordinates = re.compile(r"_-?\d+_-?\d+_-?\d+.*$")
@@ -45,13 +48,48 @@ def get_entity_name(entity_data: Dict[str, Any]):
     return f'{entity_data.get("targetname", entity_data.get("hammerid", "missing_hammer_id"))}'
 
 
+@lru_cache(16)
+def displacement_face_indices(power: int) -> np.ndarray:
+    """Triangle vertex indices of a displacement grid, same for every displacement of the given power."""
+    num_edge_vertices = (1 << power) + 1
+    i, j = np.meshgrid(np.arange(num_edge_vertices - 1), np.arange(num_edge_vertices - 1), indexing='ij')
+    index = (i * num_edge_vertices + j).ravel()
+    below = index + num_edge_vertices
+    odd = (index & 1).astype(bool)
+    triangles = np.empty((len(index), 2, 3), dtype=np.uint32)
+    triangles[:, 0, 0] = index
+    triangles[:, 0, 1] = np.where(odd, index + 1, below + 1)
+    triangles[:, 0, 2] = below
+    triangles[:, 1, 0] = np.where(odd, index + 1, index)
+    triangles[:, 1, 1] = np.where(odd, below + 1, index + 1)
+    triangles[:, 1, 2] = np.where(odd, below, below + 1)
+    return triangles.ravel()
+
+
+@lru_cache(16)
+def displacement_grid_weights(power: int) -> np.ndarray:
+    """Bilinear weights of the 4 face corners for every vertex of a displacement grid of the given power."""
+    num_edge_vertices = (1 << power) + 1
+    steps = np.arange(num_edge_vertices) / (num_edge_vertices - 1)
+    s, t = np.meshgrid(steps, steps, indexing='ij')
+    s, t = s.ravel(), t.ravel()
+    return np.stack(((1 - s) * (1 - t), s * (1 - t), s * t, (1 - s) * t), axis=1)
+
+
 class BSP:
+    # Lumps used by import stages, compressed ones are decompressed in parallel as soon as the map is opened
+    required_lumps = ('LUMP_ENTITIES', 'LUMP_MODELS', 'LUMP_VERTICES', 'LUMP_EDGES', 'LUMP_SURFEDGES', 'LUMP_FACES',
+                      'LUMP_TEXINFO', 'LUMP_TEXDATA', 'LUMP_TEXDATA_STRING_TABLE', 'LUMP_TEXDATA_STRING_DATA',
+                      'LUMP_PAK', 'LUMP_GAME_LUMP', 'LUMP_DISPINFO', 'LUMP_DISP_VERTS', 'LUMP_DISP_MULTIBLEND',
+                      'LUMP_OVERLAYS', 'LUMP_PLANES')
+
     def __init__(self, map_path, *, scale=1.0):
         self.filepath = Path(map_path)
         self.logger = log_manager.get_logger(self.filepath.name)
         self.logger.info(f'Loading map "{self.filepath}"')
         self.map_file = open_bsp(self.filepath)
         self.map_file.parse()
+        self.map_file.preload_lumps(self.required_lumps)
         self.scale = scale
         self.main_collection = bpy.data.collections.new(self.filepath.name)
         bpy.context.scene.collection.children.link(self.main_collection)
@@ -79,6 +117,10 @@ class BSP:
         self.logger.debug('Adding map pack file to content manager')
         content_manager.content_providers[Path(self.filepath).stem] = self.map_file.get_lump('LUMP_PAK')
 
+    def close(self):
+        """Releases lump data and the mapped BSP file once the import is done."""
+        self.map_file.close()
+
     def get_string(self, string_id):
         strings_lump: Optional[StringsLump] = self.map_file.get_lump('LUMP_TEXDATA_STRING_TABLE')
         return strings_lump.strings[string_id] or "NO_NAME"
@@ -91,29 +133,88 @@ class BSP:
             json.dump(entity_lump.entities, entities_json, indent=1)
         self.entity_handler.load_entities()
 
-    def load_static_props(self):
+    def load_static_props(self, instance_models=False):
         gamelump: Optional[GameLump] = self.map_file.get_lump('LUMP_GAME_LUMP')
         if gamelump:
             static_prop_lump: StaticPropLump = gamelump.game_lumps.get('sprp', None)
             if static_prop_lump:
                 parent_collection = get_or_create_collection('static_props', self.main_collection)
-                for n, prop in enumerate(static_prop_lump.static_props):
-                    model_name = static_prop_lump.model_names[prop.prop_type]
-                    location = np.multiply(prop.origin, self.scale)
-                    rotation = convert_rotation_source1_to_blender(prop.rotation)
+                if instance_models:
+                    self.load_static_prop_instances(static_prop_lump, parent_collection)
+                    self.map_file.release_lumps('LUMP_GAME_LUMP')
+                    return
+                for n, (prop_type, origin, angles, location, rotation, skin) in enumerate(
+                        self.static_prop_transforms(static_prop_lump)):
+                    model_name = static_prop_lump.model_names[prop_type]
                     self.create_empty(f'static_prop_{n}', location, rotation, None, parent_collection,
                                       custom_data={'parent_path': str(self.filepath.parent),
                                                    'prop_path': model_name,
                                                    'scale': self.scale,
                                                    'type': 'static_props',
-                                                   'skin': str(prop.skin - 1 if prop.skin != 0 else 0),
+                                                   'skin': skin,
                                                    'entity': {
                                                        'type': 'static_prop',
-                                                       'origin': '{} {} {}'.format(*prop.origin),
-                                                       'angles': '{} {} {}'.format(*prop.rotation),
-                                                       'skin': str(prop.skin - 1 if prop.skin != 0 else 0),
+                                                       'origin': '{} {} {}'.format(*origin),
+                                                       'angles': '{} {} {}'.format(*angles),
+                                                       'skin': skin,
                                                    }
                                                    })
+            self.map_file.release_lumps('LUMP_GAME_LUMP')
+
+    def static_prop_transforms(self, static_prop_lump: StaticPropLump):
+        """Yields prop type, origin, angles, blender location, blender rotation and skin of every static prop."""
+        static_props = static_prop_lump.static_props
+        origins = static_props['origin'].tolist()
+        angles = static_props['rotation'].tolist()
+        locations = (static_props['origin'] * self.scale).tolist()
+        # XYZ -> ZXY, same as convert_rotation_source1_to_blender
+        rotations = np.deg2rad(static_props['rotation'][:, [2, 0, 1]].astype(np.float64)).tolist()
+        skins = np.where(static_props['skin'] != 0, static_props['skin'] - 1, 0).astype(str).tolist()
+        return zip(static_props['prop_type'].tolist(), origins, angles, locations, rotations, skins)
+
+    def load_static_prop_instances(self, static_prop_lump: StaticPropLump, parent_collection):
+        """Imports every unique prop model once, props become objects sharing its mesh datablocks."""
+        content_manager = ContentManager()
+        model_meshes: Dict[int, List[bpy.types.Object]] = {}
+        for prop_type in np.unique(static_prop_lump.static_props['prop_type']).tolist():
+            model_name = static_prop_lump.model_names[prop_type]
+            self.logger.info(f'Loading {model_name} static prop model')
+            model_files = load_model_cm(Path(model_name), content_manager, lods=(0,))
+            if not model_files or None in model_files:
+                self.logger.error(f'Failed to find {model_name} model')
+                continue
+            model_container = import_model(*model_files, 1.0, False, False)
+            import_materials(model_container.mdl)
+            model_meshes[prop_type] = model_container.objects
+            for obj in model_container.attachments + ([model_container.armature] if model_container.armature else []):
+                bpy.data.objects.remove(obj)
+
+        for n, (prop_type, origin, angles, location, rotation, skin) in enumerate(
+                self.static_prop_transforms(static_prop_lump)):
+            model_name = static_prop_lump.model_names[prop_type]
+            for mesh_obj in model_meshes.get(prop_type, []):
+                instance = bpy.data.objects.new(f'static_prop_{n}_{mesh_obj.name}', mesh_obj.data)
+                instance.location = location
+                instance.rotation_euler = rotation
+                instance.scale = np.multiply([1.0, 1.0, 1.0], self.scale)
+                instance['skin_groups'] = mesh_obj['skin_groups']
+                instance['active_skin'] = '0'
+                instance['model_type'] = 's1'
+                instance['entity_data'] = {'prop_path': model_name,
+                                           'type': 'static_props',
+                                           'entity': {
+                                               'type': 'static_prop',
+                                               'origin': '{} {} {}'.format(*origin),
+                                               'angles': '{} {} {}'.format(*angles),
+                                               'skin': skin,
+                                           }}
+                parent_collection.objects.link(instance)
+                if skin != '0':
+                    set_object_skin(instance, skin)
+
+        for mesh_objects in model_meshes.values():
+            for mesh_obj in mesh_objects:
+                bpy.data.objects.remove(mesh_obj)
 
     def load_materials(self):
         content_manager = ContentManager()
@@ -122,6 +223,7 @@ class BSP:
         pak_lump: Optional[PakLump] = self.map_file.get_lump('LUMP_PAK')
         if pak_lump:
             content_manager.content_providers[self.filepath.stem] = pak_lump
+        material_names = []
         for texture_data in texture_data_lump.texture_data:
             material_name = self.get_string(texture_data.name_id)
             tmp = strip_patch_coordinates.sub("", material_name)[-63:]
@@ -130,15 +232,20 @@ class BSP:
                     self.logger.debug(
                         f'Skipping loading of {strip_patch_coordinates.sub("", material_name)} as it already loaded')
                     continue
+            material_names.append(material_name)
+
+        content_manager.prefetch(material_names, 'materials', '.vmt')
+        for material_name in material_names:
             self.logger.info(f"Loading {material_name} material")
-            material_file = content_manager.find_material(material_name)
+            vmt = content_manager.load_asset(material_name, Source1MaterialLoader.load_vmt, 'materials', '.vmt')
 
-            if material_file:
+            if vmt:
                 material_name = strip_patch_coordinates.sub("", material_name)
-                mat = Source1MaterialLoader(material_file, material_name)
+                mat = Source1MaterialLoader(vmt, material_name)
                 mat.create_material()
             else:
                 self.logger.error(f'Failed to find {material_name} material')
+        content_manager.clear_prefetched()
 
     def load_disp(self):
         disp_info_lump: Optional[DispInfoLump] = self.map_file.get_lump('LUMP_DISPINFO')
@@ -153,135 +260,99 @@ class BSP:
         edges = self.edge_lump.edges
 
         disp_verts = disp_verts_lump.transformed_vertices
+        disp_alpha = disp_verts_lump.vertices['alpha']
+
+        infos = disp_info_lump.infos.records
+        src_faces = self.face_lump.faces.records[infos['map_face']]
+        textures_info = self.texture_info_lump.texture_info.records[src_faces['tex_info_id']]
+        textures_data = self.texture_data_lump.texture_data.records[textures_info['texture_data_id']]
+
+        used_surf_edges = surf_edges[src_faces['first_edge'][:, None] + np.arange(4)]
+        face_vertex_ids = edges[np.abs(used_surf_edges), (used_surf_edges <= 0).astype(np.uint8)]
+        face_vertices = vertices[face_vertex_ids] * self.scale
+
+        start_positions = infos['start_position'][:, None, :]
+        matches = np.all(np.isclose(face_vertices, start_positions * self.scale, 0.5e-2), axis=2)
+        closest = np.argmin(np.sum(face_vertices - start_positions, axis=2), axis=1)
+        min_index = np.where(matches.any(axis=1), matches.argmax(axis=1), closest)
+        corners = face_vertices[np.arange(len(infos))[:, None], (min_index[:, None] + np.arange(4)) & 3]
+
+        vertex_counts = ((1 << infos['power'].astype(np.int64)) + 1) ** 2
+        has_multiblend = ((infos['min_tess'].astype(np.int64) + DISP_INFO_FLAG_MAGIC)
+                          & DISP_INFO_FLAG_HAS_MULTIBLEND) != 0
+        if disp_multiblend:
+            multiblend_counts = np.where(has_multiblend, vertex_counts, 0)
+            multiblend_offsets = np.cumsum(multiblend_counts) - multiblend_counts
+        else:
+            has_multiblend[:] = False
+
+        disp_meshes = {}
+        for power in np.unique(infos['power']):
+            group = np.nonzero(infos['power'] == power)[0]
+            grid_weights = displacement_grid_weights(int(power))
+            vertex_count = grid_weights.shape[0]
+
+            group_vertices = np.einsum('vc,kcd->kvd', grid_weights, corners[group])
+            tv1 = textures_info['texture_vectors'][group, 0]
+            tv2 = textures_info['texture_vectors'][group, 1]
+            group_uvs = np.zeros((len(group), vertex_count, 2), dtype=np.float32)
+            group_uvs[:, :, 0] = ((np.einsum('kvd,kd->kv', group_vertices, tv1[:, :3]) + tv1[:, 3:] * self.scale) /
+                                  (textures_data['view_width'][group, None] * self.scale))
+            group_uvs[:, :, 1] = 1 - ((np.einsum('kvd,kd->kv', group_vertices, tv2[:, :3]) + tv2[:, 3:] * self.scale) /
+                                      (textures_data['view_height'][group, None] * self.scale))
+
+            disp_indices = infos['disp_vert_start'][group, None] + np.arange(vertex_count, dtype=np.uint32)
+            group_vertices += disp_verts[disp_indices] * self.scale
+
+            alpha = disp_alpha[disp_indices]
+            group_colors = {'vertex_alpha': np.concatenate((alpha, alpha, alpha, np.ones_like(alpha)), axis=2)}
+
+            if has_multiblend[group].any():
+                multiblend_indices = multiblend_offsets[group, None] + np.arange(vertex_count)
+                multiblend_layers = disp_multiblend.blends[np.where(has_multiblend[group, None], multiblend_indices, 0)]
+                group_colors['multiblend'] = multiblend_layers['multiblend']
+                group_colors['alphablend'] = multiblend_layers['alphablend']
+                multiblend_colors = multiblend_layers['multiblend_colors']
+                ones = np.ones(multiblend_colors.shape[:2] + (1,), dtype=np.float32)
+                for layer_id in range(4):
+                    group_colors[f'multiblend_color{layer_id}'] = np.concatenate(
+                        (multiblend_colors[:, :, layer_id, :], ones), axis=2)
+
+            for row, info_id in enumerate(group):
+                layers = {'vertex_alpha': group_colors['vertex_alpha'][row]}
+                if has_multiblend[info_id]:
+                    layers.update({name: layer[row] for name, layer in group_colors.items()})
+                disp_meshes[info_id] = group_vertices[row], group_uvs[row], layers
 
         parent_collection = get_or_create_collection('displacements', self.main_collection)
-        info_count = len(disp_info_lump.infos)
-        multiblend_offset = 0
-        for n, disp_info in enumerate(disp_info_lump.infos):
+        info_count = len(infos)
+        for n, disp_info in enumerate(infos):
             self.logger.info(f'Processing {n + 1}/{info_count} displacement face')
-            final_vertex_colors = {}
-            src_face = disp_info.source_face
-
-            texture_info = src_face.tex_info
-            texture_data = texture_info.tex_data
-            tv1, tv2 = texture_info.texture_vectors
-
-            first_edge = src_face.first_edge
-            edge_count = src_face.edge_count
-
-            used_surf_edges = surf_edges[first_edge:first_edge + edge_count]
-            reverse = np.subtract(1, (used_surf_edges > 0).astype(np.uint8))
-            used_edges = edges[np.abs(used_surf_edges)]
-            tmp = np.arange(used_edges.shape[0])
-            face_vertex_ids = used_edges[tmp, reverse]
-            face_vertices = vertices[face_vertex_ids] * self.scale
-
-            min_index = np.where(
-                np.sum(
-                    np.isclose(face_vertices,
-                               disp_info.start_position * self.scale,
-                               0.5e-2),
-                    axis=1
-                ) == 3)
-            if min_index[0].shape[0] == 0:
-                lowest = 999.e16
-                for i, value in enumerate(np.sum(face_vertices - disp_info.start_position, axis=1)):
-                    if value < lowest:
-                        min_index = i
-                        lowest = value
-            else:
-                min_index = min_index[0][0]
-
-            left_edge = face_vertices[(1 + min_index) & 3] - face_vertices[min_index & 3]
-            right_edge = face_vertices[(2 + min_index) & 3] - face_vertices[(3 + min_index) & 3]
-
-            num_edge_vertices = (1 << disp_info.power) + 1
-            subdivide_scale = 1.0 / (num_edge_vertices - 1)
-            left_edge_step = left_edge * subdivide_scale
-            right_edge_step = right_edge * subdivide_scale
-
-            subdiv_vert_count = num_edge_vertices ** 2
-
-            disp_vertices = np.zeros((subdiv_vert_count, 3), dtype=np.float32)
-            disp_uv = np.zeros((subdiv_vert_count, 2), dtype=np.float32)
-            disp_indices = np.arange(0, subdiv_vert_count, dtype=np.uint32) + disp_info.disp_vert_start
-            for i in range(num_edge_vertices):
-                left_end = left_edge_step * i
-                left_end += face_vertices[min_index & 3]
-
-                right_end = right_edge_step * i
-                right_end += face_vertices[(3 + min_index) & 3]
-
-                left_right_seg = right_end - left_end
-                left_right_step = left_right_seg * subdivide_scale
-
-                for j in range(num_edge_vertices):
-                    disp_vertices[(i * num_edge_vertices + j)] = left_end + (left_right_step * j)
-            disp_uv[:, 0] = (np.dot(disp_vertices, tv1[:3]) + tv1[3] * self.scale) / (
-                    texture_data.view_width * self.scale)
-            disp_uv[:, 1] = 1 - ((np.dot(disp_vertices, tv2[:3]) + tv2[3] * self.scale) / (
-                    texture_data.view_height * self.scale))
-
-            disp_vertices_alpha = disp_verts_lump.vertices['alpha'][disp_indices]
-            final_vertex_colors['vertex_alpha'] = np.concatenate(
-                (np.hstack([disp_vertices_alpha, disp_vertices_alpha, disp_vertices_alpha]),
-                 np.ones((disp_vertices_alpha.shape[0], 1))), axis=1)
-
-            if disp_multiblend and disp_info.has_multiblend:
-                multiblend_layers = disp_multiblend.blends[multiblend_offset:multiblend_offset + subdiv_vert_count]
-                final_vertex_colors['multiblend'] = multiblend_layers['multiblend']
-                final_vertex_colors['alphablend'] = multiblend_layers['alphablend']
-                miltiblend_color_layer = multiblend_layers['multiblend_colors']
-                shape_ = multiblend_layers.shape[0]
-                final_vertex_colors['multiblend_color0'] = np.concatenate((miltiblend_color_layer[:, 0, :],
-                                                                           np.ones((shape_, 1))),
-                                                                          axis=1)
-                final_vertex_colors['multiblend_color1'] = np.concatenate((miltiblend_color_layer[:, 1, :],
-                                                                           np.ones((shape_, 1))),
-                                                                          axis=1)
-                final_vertex_colors['multiblend_color2'] = np.concatenate((miltiblend_color_layer[:, 2, :],
-                                                                           np.ones((shape_, 1))),
-                                                                          axis=1)
-                final_vertex_colors['multiblend_color3'] = np.concatenate((miltiblend_color_layer[:, 3, :],
-                                                                           np.ones((shape_, 1))),
-                                                                          axis=1)
-                multiblend_offset += subdiv_vert_count
-
-            face_indices = []
-            for i in range(num_edge_vertices - 1):
-                for j in range(num_edge_vertices - 1):
-                    index = i * num_edge_vertices + j
-                    if index & 1:
-                        face_indices.append((index, index + 1, index + num_edge_vertices))
-                        face_indices.append((index + 1, index + num_edge_vertices + 1, index + num_edge_vertices))
-                    else:
-                        face_indices.append((index, index + num_edge_vertices + 1, index + num_edge_vertices))
-                        face_indices.append((index, index + 1, index + num_edge_vertices + 1,))
-
-            mesh_obj = bpy.data.objects.new(f"{self.filepath.stem}_disp_{disp_info.map_face}",
+            disp_vertices, disp_uv, final_vertex_colors = disp_meshes[n]
+            vertex_indices = displacement_face_indices(int(disp_info['power']))
+
+            mesh_obj = bpy.data.objects.new(f"{self.filepath.stem}_disp_{disp_info['map_face']}",
                                             bpy.data.meshes.new(
-                                                f"{self.filepath.stem}_disp_{disp_info.map_face}_MESH"))
+                                                f"{self.filepath.stem}_disp_{disp_info['map_face']}_MESH"))
             mesh_data = mesh_obj.data
             if parent_collection is not None:
                 parent_collection.objects.link(mesh_obj)
             else:
                 self.main_collection.objects.link(mesh_obj)
-            mesh_data.from_pydata(disp_vertices + disp_verts[disp_indices] * self.scale, [], face_indices)
-
-            uv_data = mesh_data.uv_layers.new().data
-            vertex_indices = np.zeros((len(mesh_data.loops, )), dtype=np.uint32)
-            mesh_data.loops.foreach_get('vertex_index', vertex_indices)
-            uv_data.foreach_set('uv', disp_uv[vertex_indices].flatten())
+            fill_mesh(mesh_data, disp_vertices, vertex_indices, 3)
+            add_uv_layer(mesh_data, disp_uv[vertex_indices])
 
             for name, vertex_color_layer in final_vertex_colors.items():
                 vertex_colors = mesh_data.vertex_colors.get(name, False) or mesh_data.vertex_colors.new(name=name)
                 vertex_colors_data = vertex_colors.data
                 vertex_colors_data.foreach_set('color', vertex_color_layer[vertex_indices].flatten())
 
-            material_name = self.get_string(texture_data.name_id)
+            material_name = self.get_string(textures_data['name_id'][n])
             material_name = strip_patch_coordinates.sub("", material_name)[-63:]
             get_material(material_name, mesh_obj)
 
+        self.map_file.release_lumps('LUMP_DISPINFO', 'LUMP_DISP_VERTS', 'LUMP_DISP_MULTIBLEND')
+
     def load_overlays(self):
         info_overlay_lump: Optional[OverlayLump] = self.map_file.get_lump('LUMP_OVERLAYS')
         faces_lump: Optional[OverlayLump] = self.map_file.get_lump('LUMP_FACES')
@@ -307,21 +378,11 @@ class BSP:
                 else:
                     self.main_collection.objects.link(mesh_obj)
 
-                mesh_data.from_pydata(verts, [], [[0, 1, 2, 3]])
-
-                uv_data = mesh_data.uv_layers.new().data
-
-                uv_data[0].uv[0] = min(overlay.U)  # min
-                uv_data[0].uv[1] = min(overlay.V)  # min
-
-                uv_data[1].uv[0] = min(overlay.U)  # min
-                uv_data[1].uv[1] = max(overlay.V)  # max
-
-                uv_data[2].uv[0] = max(overlay.U)  # max
-                uv_data[2].uv[1] = max(overlay.V)  # max
+                fill_mesh(mesh_data, verts, [0, 1, 2, 3], 4)
 
-                uv_data[3].uv[0] = max(overlay.U)  # max
-                uv_data[3].uv[1] = min(overlay.V)  # min
+                min_u, max_u = min(overlay.U), max(overlay.U)
+                min_v, max_v = min(overlay.V), max(overlay.V)
+                add_uv_layer(mesh_data, [[min_u, min_v], [min_u, max_v], [max_u, max_v], [max_u, min_v]])
 
                 mesh_data.flip_normals()
 
@@ -1,5 +1,6 @@
 import lzma
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
 
 from ...source_shared.content_manager import ContentManager
 from ...utilities.byte_io_mdl import ByteIO
@@ -14,16 +15,39 @@ class LumpTag:
         self.steam_id = steam_id
 
 
+_lump_registry: Dict[str, List[Tuple[LumpTag, Type['Lump']]]] = {}
+_resolved_lumps: Dict[Tuple[str, int, int], Optional[Tuple[LumpTag, Type['Lump']]]] = {}
+
+
 def lump_tag(lump_id, lump_name, bsp_version=None, steam_id=None):
     def loader(klass) -> object:
         if not klass.tags:
             klass.tags = []
-        klass.tags.append(LumpTag(lump_id, lump_name, bsp_version, steam_id))
+        tag = LumpTag(lump_id, lump_name, bsp_version, steam_id)
+        klass.tags.append(tag)
+        _lump_registry.setdefault(lump_name, []).append((tag, klass))
+        _resolved_lumps.clear()
         return klass
 
     return loader
 
 
+def find_lump_class(lump_name, bsp_version, steam_id) -> Optional[Tuple[LumpTag, Type['Lump']]]:
+    """Returns first registered lump tag and class that can load lump_name for given BSP version and app id."""
+    key = lump_name, bsp_version, steam_id
+    if key not in _resolved_lumps:
+        resolved = None
+        for tag, klass in _lump_registry.get(lump_name, []):
+            if tag.bsp_version is not None and tag.bsp_version > bsp_version:
+                continue
+            if tag.steam_id is not None and tag.steam_id != steam_id:
+                continue
+            resolved = tag, klass
+            break
+        _resolved_lumps[key] = resolved
+    return _resolved_lumps[key]
+
+
 class LumpInfo:
     def __init__(self, lump_id):
         self.id = lump_id
@@ -63,23 +87,29 @@ class Lump:
         from .bsp_file import BSPFile
         self._bsp: BSPFile = bsp
         self._lump: LumpInfo = bsp.lumps_info[lump_id]
-        self.reader = ByteIO()
+        self._lump_path: Optional[Path] = None
+        self._reader: Optional[ByteIO] = None
 
         if ContentManager()._titanfall_mode:
             base_path = self._bsp.filepath.parent
             lump_path = base_path / f'{self._bsp.filepath.name}.{lump_id:04x}.bsp_lump'
 
             if lump_path.exists():
-                self.reader = ByteIO(lump_path)
-                return
+                self._lump_path = lump_path
 
-        reader = self._bsp.reader
-        reader.seek(self._lump.offset)
-
-        if not self._lump.compressed:
-            self.reader = ByteIO(reader.read(self._lump.size))
-        else:
-            self.reader = Lump.decompress_lump(reader)
+    @property
+    def reader(self) -> ByteIO:
+        """Lump data, read from the mapped BSP and decompressed on first access."""
+        if self._reader is None:
+            if self._lump_path is not None:
+                self._reader = ByteIO(self._lump_path)
+            else:
+                self._reader = self._bsp.read_lump(self._lump)
+        return self._reader
+
+    def release(self):
+        """Drops raw lump data, it will be read again if reader is accessed."""
+        self._reader = None
 
     def parse(self):
         return self
@@ -1,21 +1,20 @@
-from typing import List
+from typing import Sequence
 
 import numpy as np
 
 from .. import Lump, lump_tag
 from ..datatypes.displacement import DispInfo
+from ..datatypes.primitive import RecordList
 
 
 @lump_tag(26, 'LUMP_DISPINFO')
 class DispInfoLump(Lump):
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
-        self.infos: List[DispInfo] = []
+        self.infos: Sequence[DispInfo] = []
 
     def parse(self):
-        reader = self.reader
-        while reader:
-            self.infos.append(DispInfo(self, self._bsp).parse(reader))
+        self.infos = RecordList.from_buffer(self, self._bsp, DispInfo, self.reader.read())
         return self
 
 
@@ -1,22 +1,131 @@
-from io import StringIO
+import re
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from .. import Lump, lump_tag
 from ....utilities.keyvalues import KVParser
 
+_number = re.compile(r'[0-9.]+')
+_strip_whitespace = str.maketrans('', '', ' \t\r\n\f\v')
+
+
+def _convert_value(value: str):
+    # Same conversions as KVParser.parse_value applies to string literals
+    try:
+        if value.startswith('['):
+            value = value.replace('  ', '')
+            return tuple(map(float, value[1:-1].strip().split(' ')))
+        if value.startswith('{'):
+            value = value.replace('  ', '')
+            return tuple(map(int, value[1:-1].strip().split(' ')))
+        if _number.fullmatch(value):
+            return float(value) if '.' in value else int(value)
+    except ValueError:
+        pass
+    return value
+
+
+def _split_entities(text: str) -> Optional[List[Dict[str, Any]]]:
+    """Splits blocks of quoted "key" "value" pairs on quotes, returns None if text has anything else in it."""
+    parts = text.split('"')
+    if len(parts) % 4 != 1:
+        return None
+    strings = parts[1::2]
+    separators = parts[2::2]
+
+    head = parts[0].translate(_strip_whitespace)
+    empty_count = len(head) // 2
+    if not strings:
+        return [{} for _ in range(empty_count)] if head == '{}' * empty_count else None
+    if head != '{}' * empty_count + '{':
+        return None
+    joined_strings = ''.join(strings)
+    if '\n' in joined_strings or '\r' in joined_strings:
+        return None
+    if ''.join(separators[0::2]).translate(_strip_whitespace):
+        return None
+
+    strict_mode = KVParser.strict_mode
+    entities = [{} for _ in range(empty_count)]
+    entity = {}
+    repeated = set()
+    values = {}
+    is_open = True
+    for key, value, separator in zip(strings[0::2], strings[1::2], separators[1::2]):
+        if not is_open:
+            return None
+        key = key.lower()
+        if value not in values:
+            values[value] = _convert_value(value)
+        value = values[value]
+        if key in entity and not strict_mode:
+            if key in repeated:
+                entity[key].append(value)
+            else:
+                entity[key] = [entity[key], value]
+                repeated.add(key)
+        else:
+            entity[key] = value
+
+        if separator.isspace():
+            continue
+        braces = separator.translate(_strip_whitespace)
+        if not braces:
+            continue
+        empty_count = (len(braces) - 1) // 2
+        is_open = len(braces) % 2 == 0
+        if braces != '}' + '{}' * empty_count + ('{' if is_open else ''):
+            return None
+        entities.append(entity)
+        entities.extend({} for _ in range(empty_count))
+        entity = {}
+        repeated.clear()
+    if is_open:
+        return None
+    return entities
+
+
+def parse_entities(name: str, text: str) -> List[Dict[str, Any]]:
+    """Parses entity list text into the same dicts KVParser would produce.
+
+    Plain quoted key/value blocks take a fast path, anything else goes through KVParser.
+    """
+    text = text.split('\0', 1)[0]
+    entities = _split_entities(text)
+    if entities is not None:
+        return entities
+
+    entities = []
+    parser = KVParser(name, text)
+    entity = parser.parse_value()
+    while entity is not None:
+        entities.append(entity)
+        entity = parser.parse_value()
+    return entities
+
+
+def index_entities(entities: List[Dict[str, Any]]) -> Tuple[Dict[str, List[dict]], Dict[Any, dict]]:
+    """Groups entities by classname and maps targetnames to entities, last entity wins on duplicate names."""
+    by_class = {}
+    by_name = {}
+    for entity in entities:
+        by_class.setdefault(entity.get('classname', None), []).append(entity)
+        if 'targetname' in entity:
+            by_name[entity['targetname']] = entity
+    return by_class, by_name
+
 
 @lump_tag(0, 'LUMP_ENTITIES')
 class EntityLump(Lump):
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
         self.entities = []
+        self.entities_by_class: Dict[str, List[dict]] = {}
+        self.entities_by_name: Dict[Any, dict] = {}
 
     def parse(self):
-        parser = KVParser('EntityLump', self.reader.read(-1).decode())
-        entity = parser.parse_value()
-        while entity is not None:
-            self.entities.append(entity)
-            entity = parser.parse_value()
+        self.entities = parse_entities('EntityLump', self.reader.read(-1).decode())
+        self.entities_by_class, self.entities_by_name = index_entities(self.entities)
         return self
 
 
@@ -25,6 +134,8 @@ class EntityPartitionsLump(Lump):
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
         self.entities = []
+        self.entities_by_class: Dict[str, List[dict]] = {}
+        self.entities_by_name: Dict[Any, dict] = {}
 
     def parse(self):
         data = self.reader.read_ascii_string(-1)
@@ -35,10 +146,7 @@ class EntityPartitionsLump(Lump):
                 with ent_path.open('r') as f:
                     magic = f.read(11).strip()
                     assert magic == 'ENTITIES01', 'Invalid ent file'
-                    parser = KVParser('EntityLump', f.read(-1))
-                    entity = parser.parse_value()
-                    while entity is not None:
-                        self.entities.append(entity)
-                        entity = parser.parse_value()
+                    self.entities.extend(parse_entities('EntityLump', f.read(-1)))
+        self.entities_by_class, self.entities_by_name = index_entities(self.entities)
 
         return self
@@ -1,19 +1,18 @@
-from typing import List
+from typing import Sequence
 
 from .. import Lump, lump_tag
 from ..datatypes.face import Face
+from ..datatypes.primitive import RecordList
 
 
 @lump_tag(7, 'LUMP_FACES')
 class FaceLump(Lump):
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
-        self.faces: List[Face] = []
+        self.faces: Sequence[Face] = []
 
     def parse(self):
-        reader = self.reader
-        while reader:
-            self.faces.append(Face(self, self._bsp).parse(reader))
+        self.faces = RecordList.from_buffer(self, self._bsp, Face, self.reader.read())
         return self
 
 
@@ -21,10 +20,8 @@ class FaceLump(Lump):
 class OriginalFaceLump(Lump):
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
-        self.faces: List[Face] = []
+        self.faces: Sequence[Face] = []
 
     def parse(self):
-        reader = self.reader
-        while reader:
-            self.faces.append(Face(self, self._bsp).parse(reader))
+        self.faces = RecordList.from_buffer(self, self._bsp, Face, self.reader.read())
         return self
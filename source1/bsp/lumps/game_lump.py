@@ -1,6 +1,8 @@
+from concurrent.futures import Future
 from typing import List
 
 from .. import Lump, lump_tag
+from ....utilities.decompression_pool import get_decompression_pool
 from ..datatypes.game_lump_header import GameLumpHeader
 from ..datatypes.gamelumps.detail_prop_lump import DetailPropLump
 from ..datatypes.gamelumps.static_prop_lump import StaticPropLump
@@ -24,7 +26,10 @@ class GameLump(Lump):
             if not lump.id:
                 continue
             self.game_lumps_info.append(lump)
+        game_lump_readers = {}
         for lump in self.game_lumps_info:
+            if lump.id not in ('sprp', 'dprp'):
+                continue
             relative_offset = lump.offset - self._lump.offset
             print(f'GLump "{lump.id}" offset: {relative_offset} size: {lump.size} ')
             with reader.save_current_pos():
@@ -37,11 +42,17 @@ class GameLump(Lump):
                         next_offset = self._lump.size
                     compressed_size = next_offset - relative_offset
                     buffer = reader.read(compressed_size)
-                    game_lump_reader = Lump.decompress_lump(ByteIO(buffer))
+                    game_lump_readers[lump.id] = get_decompression_pool().submit(Lump.decompress_lump,
+                                                                                 ByteIO(buffer))
                 else:
-                    game_lump_reader = ByteIO(reader.read(lump.size))
+                    game_lump_readers[lump.id] = ByteIO(reader.read(lump.size))
 
-                pass  # TODO
+        for lump in self.game_lumps_info:
+            game_lump_reader = game_lump_readers.get(lump.id, None)
+            if game_lump_reader is None:
+                continue
+            if isinstance(game_lump_reader, Future):
+                game_lump_reader = game_lump_reader.result()
             if lump.id == 'sprp':
                 game_lump = StaticPropLump(lump)
                 game_lump.parse(game_lump_reader)
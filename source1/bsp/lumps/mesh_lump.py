@@ -1,17 +1,16 @@
-from typing import List
+from typing import Sequence
 
 from .. import Lump, lump_tag
 from ..datatypes.mesh import Mesh
+from ..datatypes.primitive import RecordList
 
 
 @lump_tag(0x50, 'LUMP_MESHES', 29)
 class MeshLump(Lump):
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
-        self.meshes: List[Mesh] = []
+        self.meshes: Sequence[Mesh] = []
 
     def parse(self):
-        reader = self.reader
-        while reader:
-            self.meshes.append(Mesh(self, self._bsp).parse(reader))
+        self.meshes = RecordList.from_buffer(self, self._bsp, Mesh, self.reader.read())
         return self
@@ -1,20 +1,17 @@
-from typing import List
+from typing import Sequence
 
 from .. import Lump, lump_tag
 from ..datatypes.model import Model, RespawnModel
+from ..datatypes.primitive import RecordList
 
 
 @lump_tag(14, 'LUMP_MODELS')
 class ModelLump(Lump):
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
-        self.models: List[Model] = []
+        self.models: Sequence[Model] = []
 
     def parse(self):
-        reader = self.reader
-        while reader:
-            if self._bsp.version < 29:
-                self.models.append(Model(self, self._bsp).parse(reader))
-            else:
-                self.models.append(RespawnModel(self, self._bsp).parse(reader))
+        record_class = Model if self._bsp.version < 29 else RespawnModel
+        self.models = RecordList.from_buffer(self, self._bsp, record_class, self.reader.read())
         return self
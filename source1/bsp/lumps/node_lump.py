@@ -1,5 +1,6 @@
 from .. import Lump, lump_tag
 from ..datatypes.node import Node
+from ..datatypes.primitive import RecordList
 
 
 @lump_tag(5, 'LUMP_NODES')
@@ -10,8 +11,5 @@ class NodeLump(Lump):
         self.nodes = []
 
     def parse(self):
-        reader = self.reader
-        while reader:
-            plane = Node(self, self._bsp).parse(reader)
-            self.nodes.append(plane)
+        self.nodes = RecordList.from_buffer(self, self._bsp, Node, self.reader.read())
         return self
@@ -2,6 +2,7 @@ from io import BytesIO
 from pathlib import Path, PurePath
 
 from .. import Lump, lump_tag
+from ....utilities.path_utilities import path_hashes
 import zipfile
 
 
@@ -35,6 +36,9 @@ class PakLump(Lump):
             return BytesIO(self.zip_file.open(new_filepath, 'r').read())
         return None
 
+    def index_files(self):
+        return path_hashes(list(self._cache.keys()))
+
     @property
     def steam_id(self):
         return -1
@@ -1,8 +1,9 @@
-from typing import List
+from typing import Sequence
 
 from .. import Lump, lump_tag
 from ..datatypes.texture_data import TextureData, RespawnTextureData
 from ..datatypes.texture_info import TextureInfo
+from ..datatypes.primitive import RecordList
 
 
 @lump_tag(6, 'LUMP_TEXINFO')
@@ -10,12 +11,10 @@ class TextureInfoLump(Lump):
 
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
-        self.texture_info: List[TextureInfo] = []
+        self.texture_info: Sequence[TextureInfo] = []
 
     def parse(self):
-        reader = self.reader
-        while reader:
-            self.texture_info.append(TextureInfo(self, self._bsp).parse(reader))
+        self.texture_info = RecordList.from_buffer(self, self._bsp, TextureInfo, self.reader.read())
         return self
 
 
@@ -24,13 +23,9 @@ class TextureDataLump(Lump):
 
     def __init__(self, bsp, lump_id):
         super().__init__(bsp, lump_id)
-        self.texture_data: List[TextureData] = []
+        self.texture_data: Sequence[TextureData] = []
 
     def parse(self):
-        reader = self.reader
-        while reader:
-            if self._bsp.version < 29:
-                self.texture_data.append(TextureData(self, self._bsp).parse(reader))
-            else:
-                self.texture_data.append(RespawnTextureData(self, self._bsp).parse(reader))
+        record_class = TextureData if self._bsp.version < 29 else RespawnTextureData
+        self.texture_data = RecordList.from_buffer(self, self._bsp, record_class, self.reader.read())
         return self
@@ -13,7 +13,7 @@ from ...utilities.path_utilities import find_vtx, backwalk_file_resolver, find_v
 from .sfm import open_session
 from .sfm.camera import Camera
 from ..bsp.import_bsp import BSP
-from ..mdl.import_mdl import import_model, import_materials, put_into_collections
+from ..mdl.import_mdl import import_model, import_materials, put_into_collections, load_model_cm
 
 
 def _convert_quat(quat):
@@ -23,11 +23,9 @@ def _convert_quat(quat):
 
 def import_gamemodel(mdl_path, scale=HAMMER_UNIT_TO_METERS):
     mdl_path = Path(mdl_path)
-    mld_file = ContentManager().find_file(mdl_path)
-    if mld_file:
-        vvd_file = ContentManager().find_file(mdl_path.with_suffix('.vvd'))
-        vtx_file = find_vtx_cm(mdl_path, ContentManager())
-        model_container = import_model(mld_file, vvd_file, vtx_file, scale, False, True)
+    model_files = load_model_cm(mdl_path, ContentManager(), lods=(0,))
+    if model_files:
+        model_container = import_model(*model_files, scale, False, True)
         # import_materials(model_container.mdl)
         put_into_collections(model_container, mdl_path.stem, bodygroup_grouping=True)
         return model_container
@@ -110,6 +108,7 @@ def load_session(session_path: Path, scale=HAMMER_UNIT_TO_METERS):
         # bsp_map.load_static_props()
         # bsp_map.load_detail_props()
         # bsp_map.load_materials()
+        bsp_map.close()
 
     for shot in active_clip.sub_clip_track_group.tracks[0].children[:1]:
         camera = shot.camera
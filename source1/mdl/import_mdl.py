@@ -1,5 +1,6 @@
+from functools import partial
 from pathlib import Path
-from typing import BinaryIO, Iterable, Sized, Union
+from typing import BinaryIO, Iterable, Sized, Union, Optional, Tuple
 
 import bpy
 import numpy as np
@@ -16,7 +17,7 @@ from ..vtx.vtx import Vtx
 from ..vvd.vvd import Vvd
 from ...bpy_utilities.logging import BPYLoggingManager
 from ...bpy_utilities.material_loader.material_loader import Source1MaterialLoader
-from ...bpy_utilities.utils import get_material, get_new_unique_collection
+from ...bpy_utilities.utils import get_material, get_new_unique_collection, fill_mesh, add_uv_layer
 from ...source_shared.content_manager import ContentManager
 from ...source_shared.model_container import Source1ModelContainer
 
@@ -63,6 +64,41 @@ def get_slice(data: [Iterable, Sized], start, count=None):
     return data[start:start + count]
 
 
+def group_bone_weights(bone_ids: np.ndarray, weights: np.ndarray):
+    """Groups nonzero (vertex, bone, weight) influences into (bone, weight, vertex indices) batches.
+
+    When a vertex references the same bone more than once, the last slot wins, same as sequential 'REPLACE' adds.
+    """
+    slot_count = bone_ids.shape[1]
+    bone_ids = bone_ids.reshape(-1).astype(np.int64)
+    weights = weights.reshape(-1)
+    vertex_ids = np.repeat(np.arange(len(bone_ids) // slot_count, dtype=np.int64), slot_count)
+    mask = weights > 0
+    bone_ids, weights, vertex_ids = bone_ids[mask], weights[mask], vertex_ids[mask]
+    if not len(weights):
+        return
+
+    keys = vertex_ids * (bone_ids.max() + 1) + bone_ids
+    _, last = np.unique(keys[::-1], return_index=True)
+    last = len(keys) - 1 - last
+    bone_ids, weights, vertex_ids = bone_ids[last], weights[last], vertex_ids[last]
+
+    order = np.lexsort((vertex_ids, weights, bone_ids))
+    bone_ids, weights, vertex_ids = bone_ids[order], weights[order], vertex_ids[order]
+    splits = np.flatnonzero((bone_ids[1:] != bone_ids[:-1]) | (weights[1:] != weights[:-1])) + 1
+    for start, end in zip(np.concatenate(([0], splits)), np.concatenate((splits, [len(order)]))):
+        yield int(bone_ids[start]), float(weights[start]), vertex_ids[start:end].tolist()
+
+
+def assign_bone_weights(mesh_obj, mdl: Mdl, bone_ids: np.ndarray, weights: np.ndarray):
+    weight_groups = {bone.name: mesh_obj.vertex_groups.new(name=bone.name) for bone in mdl.bones}
+    group_names = list(weight_groups.keys())
+    # Bones sharing a name share a vertex group, remap so they are deduplicated together
+    bone_to_group = np.array([group_names.index(bone.name) for bone in mdl.bones], dtype=np.int64)
+    for group_index, weight, vertex_indices in group_bone_weights(bone_to_group[bone_ids], weights):
+        weight_groups[group_names[group_index]].add(vertex_indices, weight, 'REPLACE')
+
+
 def create_armature(mdl: Mdl, scale=1.0):
     model_name = Path(mdl.header.name).stem
     armature = bpy.data.armatures.new(f"{model_name}_ARM_DATA")
@@ -101,19 +137,67 @@ def create_armature(mdl: Mdl, scale=1.0):
     return armature_obj
 
 
-def import_model(mdl_file: BinaryIO, vvd_file: BinaryIO, vtx_file: BinaryIO, scale=1.0,
-                 create_drivers=False, re_use_meshes=False):
+def read_mdl(mdl_file: BinaryIO) -> Mdl:
     mdl = Mdl(mdl_file)
     mdl.read()
+    return mdl
+
+
+def read_vvd(vvd_file: BinaryIO, lods: Optional[Iterable[int]] = None) -> Vvd:
     vvd = Vvd(vvd_file)
-    vvd.read()
+    vvd.read(lods)
+    return vvd
+
+
+def read_vtx(vtx_file: BinaryIO, lods: Optional[Iterable[int]] = None) -> Vtx:
     vtx = Vtx(vtx_file)
-    vtx.read()
+    vtx.read(lods)
+    return vtx
+
+
+def load_model_cm(mdl_path: Path, content_manager: ContentManager,
+                  lods: Optional[Tuple[int, ...]] = None) -> Optional[Tuple[Mdl, Vvd, Vtx]]:
+    """Parses mdl, vvd and vtx through the shared asset cache, so repeated props are only read once.
+
+    If lods is given, only those LODs are decoded, the cache keeps such assets apart from fully parsed ones.
+    """
+    mdl = content_manager.load_asset(mdl_path, read_mdl)
+    if mdl is None:
+        return None
+    vvd_loader = read_vvd if lods is None else partial(read_vvd, lods=lods)
+    vtx_loader = read_vtx if lods is None else partial(read_vtx, lods=lods)
+    vvd = content_manager.load_asset(mdl_path.with_suffix('.vvd'), vvd_loader)
+    vtx = None
+    for vtx_version in [70, 80, 11, 12, 90][::-1]:
+        vtx = content_manager.load_asset(mdl_path.with_suffix(f'.dx{vtx_version}.vtx'), vtx_loader)
+        if vtx is not None:
+            break
+    return mdl, vvd, vtx
+
+
+def get_lod_count(vvd: Vvd, vtx: Vtx):
+    return max(1, min(vvd.header.lod_count, vtx.header.lod_count))
+
+
+def import_model(mdl_file: Union[BinaryIO, Mdl], vvd_file: Union[BinaryIO, Vvd], vtx_file: Union[BinaryIO, Vtx],
+                 scale=1.0, create_drivers=False, re_use_meshes=False, desired_lod=0, import_all_lods=False):
+    """Imports meshes of desired_lod, clamped to the last LOD the model has.
+
+    With import_all_lods every other LOD is imported too and stored in container.lod_objects.
+    Files that are not parsed yet only get the LODs that are going to be imported decoded.
+    """
+    lods = None if import_all_lods else (desired_lod,)
+    mdl = mdl_file if isinstance(mdl_file, Mdl) else read_mdl(mdl_file)
+    vvd = vvd_file if isinstance(vvd_file, Vvd) else read_vvd(vvd_file, lods)
+    vtx = vtx_file if isinstance(vtx_file, Vtx) else read_vtx(vtx_file, lods)
 
     container = Source1ModelContainer(mdl, vvd, vtx)
 
-    desired_lod = 0
-    all_vertices = vvd.lod_data[desired_lod]
+    lod_count = get_lod_count(vvd, vtx)
+    desired_lod = min(desired_lod, lod_count - 1)
+    if desired_lod not in vvd.lod_data:
+        logger.warn(f'LOD{desired_lod} of {mdl.header.name} was not decoded')
+        return container
 
     static_prop = mdl.header.flags & StudioHDRFlags.STATIC_PROP != 0
     armature = None
@@ -125,104 +209,113 @@ def import_model(mdl_file: BinaryIO, vvd_file: BinaryIO, vtx_file: BinaryIO, sca
         armature = create_armature(mdl, scale)
         container.armature = armature
 
-    for vtx_body_part, body_part in zip(vtx.body_parts, mdl.body_parts):
-        for vtx_model, model in zip(vtx_body_part.models, body_part.models):
-
-            if model.vertex_count == 0:
-                continue
-            mesh_name = f'{body_part.name}_{model.name}'
-            used_copy = False
-            if re_use_meshes and static_prop:
-                mesh_obj_original = bpy.data.objects.get(mesh_name, None)
-                mesh_data_original = bpy.data.meshes.get(f'{mesh_name}_MESH', False)
-                if mesh_obj_original and mesh_data_original:
-                    mesh_data = mesh_data_original.copy()
-                    mesh_obj = mesh_obj_original.copy()
-                    mesh_obj['skin_groups'] = mesh_obj_original['skin_groups']
-                    mesh_obj['active_skin'] = mesh_obj_original['active_skin']
-                    mesh_obj['model_type'] = 's1'
-                    mesh_obj.data = mesh_data
-                    used_copy = True
+    for lod in (range(lod_count) if import_all_lods else (desired_lod,)):
+        if lod not in vvd.lod_data:
+            # Files parsed for a subset of LODs, e.g. shared through the asset cache
+            continue
+        all_vertices = vvd.lod_data[lod]
+        for vtx_body_part, body_part in zip(vtx.body_parts, mdl.body_parts):
+            for vtx_model, model in zip(vtx_body_part.models, body_part.models):
+
+                if model.vertex_count == 0 or lod >= len(vtx_model.model_lods):
+                    continue
+                vtx_lod = vtx_model.model_lods[lod]
+                if not any(vtx_mesh.strip_groups for vtx_mesh in vtx_lod.meshes):
+                    continue
+                mesh_name = f'{body_part.name}_{model.name}'
+                if lod != 0:
+                    mesh_name += f'_LOD{lod}'
+                used_copy = False
+                if re_use_meshes and static_prop:
+                    mesh_obj_original = bpy.data.objects.get(mesh_name, None)
+                    mesh_data_original = bpy.data.meshes.get(f'{mesh_name}_MESH', False)
+                    if mesh_obj_original and mesh_data_original:
+                        mesh_data = mesh_data_original.copy()
+                        mesh_obj = mesh_obj_original.copy()
+                        mesh_obj['skin_groups'] = mesh_obj_original['skin_groups']
+                        mesh_obj['active_skin'] = mesh_obj_original['active_skin']
+                        mesh_obj['model_type'] = 's1'
+                        mesh_obj.data = mesh_data
+                        used_copy = True
+                    else:
+                        mesh_data = bpy.data.meshes.new(f'{mesh_name}_MESH')
+                        mesh_obj = bpy.data.objects.new(mesh_name, mesh_data)
+                        mesh_obj['skin_groups'] = {str(n): group for (n, group) in enumerate(mdl.skin_groups)}
+                        mesh_obj['active_skin'] = '0'
+                        mesh_obj['model_type'] = 's1'
                 else:
                     mesh_data = bpy.data.meshes.new(f'{mesh_name}_MESH')
                     mesh_obj = bpy.data.objects.new(mesh_name, mesh_data)
                     mesh_obj['skin_groups'] = {str(n): group for (n, group) in enumerate(mdl.skin_groups)}
                     mesh_obj['active_skin'] = '0'
                     mesh_obj['model_type'] = 's1'
-            else:
-                mesh_data = bpy.data.meshes.new(f'{mesh_name}_MESH')
-                mesh_obj = bpy.data.objects.new(mesh_name, mesh_data)
-                mesh_obj['skin_groups'] = {str(n): group for (n, group) in enumerate(mdl.skin_groups)}
-                mesh_obj['active_skin'] = '0'
-                mesh_obj['model_type'] = 's1'
-
-            if not static_prop:
-                modifier = mesh_obj.modifiers.new(
-                    type="ARMATURE", name="Armature")
-                modifier.object = armature
-                mesh_obj.parent = armature
-
-            container.objects.append(mesh_obj)
-            container.bodygroups[body_part.name].append(mesh_obj)
-
-            if used_copy:
-                continue
 
-            model_vertices = get_slice(all_vertices, model.vertex_offset, model.vertex_count)
-            vtx_vertices, indices_array, material_indices_array = merge_meshes(model, vtx_model.model_lods[desired_lod])
-
-            indices_array = np.array(indices_array, dtype=np.uint32)
-            vertices = model_vertices[vtx_vertices]
-
-            mesh_data.from_pydata(vertices['vertex'] * scale, [], np.flip(indices_array).reshape((-1, 3)).tolist())
-            mesh_data.update()
-
-            mesh_data.polygons.foreach_set("use_smooth", np.ones(len(mesh_data.polygons)))
-            mesh_data.normals_split_custom_set_from_vertices(vertices['normal'])
-            mesh_data.use_auto_smooth = True
-
-            material_remapper = np.zeros((material_indices_array.max() + 1,), dtype=np.uint32)
-            for mat_id in np.unique(material_indices_array):
-                mat_name = mdl.materials[mat_id].name
-                material_remapper[mat_id] = get_material(mat_name[-63:], mesh_obj)
-
-            mesh_data.polygons.foreach_set('material_index', material_remapper[material_indices_array[::-1]].tolist())
-
-            mesh_data.uv_layers.new()
-            uv_data = mesh_data.uv_layers[0].data
-
-            vertex_indices = np.zeros((len(mesh_data.loops, )), dtype=np.uint32)
-            mesh_data.loops.foreach_get('vertex_index', vertex_indices)
-            uvs = vertices['uv']
-            uvs[:, 1] = 1 - uvs[:, 1]
-            uv_data.foreach_set('uv', uvs[vertex_indices].flatten())
-
-            if not static_prop:
-                weight_groups = {bone.name: mesh_obj.vertex_groups.new(name=bone.name) for bone in mdl.bones}
-
-                for n, (bone_indices, bone_weights) in enumerate(zip(vertices['bone_id'], vertices['weight'])):
-                    for bone_index, weight in zip(bone_indices, bone_weights):
-                        if weight > 0:
-                            bone_name = mdl.bones[bone_index].name
-                            weight_groups[bone_name].add([n], weight, 'REPLACE')
-                flex_names = []
-                for mesh in model.meshes:
-                    if mesh.flexes:
-                        flex_names.extend([mdl.flex_names[flex.flex_desc_index] for flex in mesh.flexes])
-                if flex_names:
-                    mesh_obj.shape_key_add(name='base')
-                for flex_name in flex_names:
-                    shape_key = mesh_data.shape_keys.key_blocks.get(flex_name, None) or mesh_obj.shape_key_add(
-                        name=flex_name)
-                    vertex_animation = vac.vertex_cache[flex_name]
-
-                    model_vertices = get_slice(vertex_animation, model.vertex_offset, model.vertex_count)
-                    flex_vertices = model_vertices[vtx_vertices] * scale
-
-                    shape_key.data.foreach_set("co", flex_vertices.reshape(-1))
-
-                if create_drivers:
-                    create_flex_drivers(mesh_obj, mdl)
+                if not static_prop:
+                    modifier = mesh_obj.modifiers.new(
+                        type="ARMATURE", name="Armature")
+                    modifier.object = armature
+                    mesh_obj.parent = armature
+
+                if lod == desired_lod:
+                    container.objects.append(mesh_obj)
+                    container.bodygroups[body_part.name].append(mesh_obj)
+                else:
+                    container.lod_objects[lod].append(mesh_obj)
+
+                if used_copy:
+                    continue
+
+                model_vertices = get_slice(all_vertices, model.vertex_offset, model.vertex_count)
+                vtx_vertices, indices_array, material_indices_array = merge_meshes(model, vtx_lod)
+
+                indices_array = np.array(indices_array, dtype=np.uint32)
+                vertices = model_vertices[vtx_vertices]
+
+                loops = np.flip(indices_array)
+                fill_mesh(mesh_data, vertices['vertex'] * scale, loops, 3)
+
+                mesh_data.polygons.foreach_set("use_smooth", np.ones(len(mesh_data.polygons)))
+                mesh_data.normals_split_custom_set_from_vertices(vertices['normal'])
+                mesh_data.use_auto_smooth = True
+
+                material_remapper = np.zeros((material_indices_array.max() + 1,), dtype=np.uint32)
+                for mat_id in np.unique(material_indices_array):
+                    mat_name = mdl.materials[mat_id].name
+                    material_remapper[mat_id] = get_material(mat_name[-63:], mesh_obj)
+
+                mesh_data.polygons.foreach_set('material_index',
+                                               material_remapper[material_indices_array[::-1]].tolist())
+
+                uvs = vertices['uv']
+                uvs[:, 1] = 1 - uvs[:, 1]
+                add_uv_layer(mesh_data, uvs[loops])
+
+                if not static_prop:
+                    assign_bone_weights(mesh_obj, mdl, vertices['bone_id'], vertices['weight'])
+                    if lod != 0:
+                        # Flex vertex indices are only valid for LOD0 vertex layout
+                        continue
+                    flex_names = []
+                    for mesh in model.meshes:
+                        if mesh.flexes:
+                            flex_names.extend([mdl.flex_names[flex.flex_desc_index] for flex in mesh.flexes])
+                    if flex_names:
+                        mesh_obj.shape_key_add(name='base')
+                        base_positions = model_vertices['vertex']
+                        flex_buffer = base_positions.copy()
+                        flex_vertices = np.empty((len(vtx_vertices), 3), dtype=flex_buffer.dtype)
+                    for flex_name in flex_names:
+                        shape_key = mesh_data.shape_keys.key_blocks.get(flex_name, None) or mesh_obj.shape_key_add(
+                            name=flex_name)
+                        touched = vac.apply_flex(flex_name, flex_buffer, model.vertex_offset)
+                        np.take(flex_buffer, vtx_vertices, axis=0, out=flex_vertices)
+                        flex_vertices *= scale
+                        flex_buffer[touched] = base_positions[touched]
+
+                        shape_key.data.foreach_set("co", flex_vertices.reshape(-1))
+
+                    if create_drivers:
+                        create_flex_drivers(mesh_obj, mdl)
     if mdl.attachments:
         attachments = create_attachments(mdl, armature if not static_prop else container.objects[0], scale)
         container.attachments.extend(attachments)
@@ -249,6 +342,11 @@ def put_into_collections(model_container: Source1ModelContainer, model_name,
         attachments_collection = get_new_unique_collection(model_name + '_ATTACHMENTS', master_collection)
         for attachment in model_container.attachments:
             attachments_collection.objects.link(attachment)
+
+    for lod, meshes in sorted(model_container.lod_objects.items()):
+        lod_collection = get_new_unique_collection(f'{model_name}_LOD{lod}', master_collection)
+        for mesh in meshes:
+            lod_collection.objects.link(mesh)
     return master_collection
 
 
@@ -314,16 +412,24 @@ def create_attachments(mdl: Mdl, armature: bpy.types.Object, scale):
 
 def import_materials(mdl):
     content_manager = ContentManager()
+    materials = []
     for material in mdl.materials:
         if bpy.data.materials.get(material.name[-63:], False):
             if bpy.data.materials[material.name[-63:]].get('source1_loaded', False):
                 logger.info(f'Skipping loading of {material.name[-63:]} as it already loaded')
                 continue
-        material_path = None
+        materials.append(material)
+
+    content_manager.prefetch([tuple(Path(mat_path) / material.name for mat_path in mdl.materials_paths)
+                              for material in materials], 'materials', '.vmt')
+    for material in materials:
+        vmt = None
         for mat_path in mdl.materials_paths:
-            material_path = content_manager.find_material(Path(mat_path) / material.name)
-            if material_path:
+            vmt = content_manager.load_asset(Path(mat_path) / material.name, Source1MaterialLoader.load_vmt,
+                                             'materials', '.vmt')
+            if vmt:
                 break
-        if material_path:
-            new_material = Source1MaterialLoader(material_path, material.name[-63:])
+        if vmt:
+            new_material = Source1MaterialLoader(vmt, material.name[-63:])
             new_material.create_material()
+    content_manager.clear_prefetched()
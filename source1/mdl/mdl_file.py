@@ -5,7 +5,7 @@ from typing import List
 import numpy as np
 
 from ...utilities.byte_io_mdl import ByteIO
-from ...source_shared.base import Base
+from ...source_shared.base import Base, ParseContext
 
 from .flex_expressions import *
 from .structs.header import Header
@@ -27,7 +27,7 @@ class _AnimBlocks:
 class Mdl(Base):
 
     def __init__(self, filepath):
-        self.store_value("MDL", self)
+        self.context = ParseContext(MDL=self)
         self.reader = ByteIO(filepath)
         self.header = Header()
         self.bones = []  # type: List[Bone]
@@ -76,18 +76,18 @@ class Mdl(Base):
         print(orig_checksum, new_checksum)
 
     def read(self):
-        self.header.read(self.reader)
+        self.header.read(self.reader, self.context)
 
         self.reader.seek(self.header.bone_offset)
         for _ in range(self.header.bone_count):
             bone = Bone()
-            bone.read(self.reader)
+            bone.read(self.reader, self.context)
             self.bones.append(bone)
 
         self.reader.seek(self.header.texture_offset)
         for _ in range(self.header.texture_count):
             texture = Material()
-            texture.read(self.reader)
+            texture.read(self.reader, self.context)
             self.materials.append(texture)
 
         self.reader.seek(self.header.texture_path_offset)
@@ -143,7 +143,7 @@ class Mdl(Base):
         self.reader.seek(self.header.body_part_offset)
         for _ in range(self.header.body_part_count):
             body_part = BodyPart()
-            body_part.read(self.reader)
+            body_part.read(self.reader, self.context)
             self.body_parts.append(body_part)
 
         # self.reader.seek(self.header.local_animation_offset)
@@ -1,7 +1,7 @@
 from enum import IntFlag
 
 from ....utilities.byte_io_mdl  import ByteIO
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 
 
 # noinspection SpellCheckingInspection
@@ -98,10 +98,10 @@ class AnimDesc(Base):
                 # TODO: https://github.com/ZeqMacaw/Crowbar/blob/5e4effa8491b358b8bae6f205599358880b7ee85/Crowbar/Core/GameModel/SourceModel49/SourceMdlFile49.vb#L1148
                 raise NotImplementedError()
 
-    def read_frames(self, reader, offset, section_id):
+    def read_frames(self, reader, offset, section_id, context: ParseContext):
         if self.flags & AnimDescFlags.FRAMEANIM == 0:
             from ..mdl_file import Mdl
-            mdl: Mdl = self.get_value('MDL')
+            mdl: Mdl = context.get_value('MDL')
             # section_count = (self.frame_count // self.section_frame_count) + 2
             bone_count = len(mdl.bones)
 
@@ -1,7 +1,7 @@
 from typing import List
 
 from ....utilities.byte_io_mdl  import ByteIO
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from .model import Model
 
 
@@ -11,7 +11,7 @@ class BodyPart(Base):
         self.name = ""
         self.models = []  # type: List[Model]
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
         self.name = reader.read_source1_string(entry) or "no-name"
         model_count = reader.read_uint32()
@@ -22,5 +22,5 @@ class BodyPart(Base):
                 reader.seek(entry + model_offset)
                 for _ in range(model_count):
                     model = Model()
-                    model.read(reader)
+                    model.read(reader, context)
                     self.models.append(model)
@@ -3,7 +3,7 @@ from enum import IntFlag, IntEnum
 import numpy as np
 
 from ....utilities.byte_io_mdl import ByteIO
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 
 from .axis_interp_rule import AxisInterpRule
 from .jiggle_bone import JiggleRule
@@ -150,11 +150,12 @@ class Bone(Base):
         self.surface_prop = ''
 
         self.procedural_rule = None
+        self._mdl = None
 
     @property
     def children(self):
         from ..mdl_file import Mdl
-        mdl: Mdl = self.get_value("MDL")
+        mdl: Mdl = self._mdl
         childes = []
         if mdl.bones:
             bone_index = mdl.bones.index(self)
@@ -184,12 +185,13 @@ class Bone(Base):
     @property
     def parent(self):
         from ..mdl_file import Mdl
-        mdl: Mdl = self.get_value("MDL")
+        mdl: Mdl = self._mdl
         if mdl.bones and self.parent_bone_index != -1:
             return mdl.bones[self.parent_bone_index]
         return None
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
+        self._mdl = context.get_value('MDL')
         entry = reader.tell()
         self.name = reader.read_source1_string(entry)
         self.parent_bone_index = reader.read_int32()
@@ -209,9 +211,9 @@ class Bone(Base):
         self.physics_bone_index = reader.read_uint32()
         self.surface_prop = reader.read_source1_string(entry)
         self.contents = Contents(reader.read_uint32())
-        if self.get_value('mdl_version') >= 44:
+        if context.get_value('mdl_version') >= 44:
             _ = [reader.read_uint32() for _ in range(8)]
-        if self.get_value('mdl_version') >= 53:
+        if context.get_value('mdl_version') >= 53:
             reader.skip(4 * 7)
 
         if self.procedural_rule_type != 0 and procedural_rule_offset != 0:
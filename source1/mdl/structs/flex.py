@@ -6,7 +6,7 @@ from typing import List
 import numpy as np
 
 from ....utilities.byte_io_mdl import ByteIO
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from .float16 import int16_to_float
 
 
@@ -140,10 +140,10 @@ class Flex(Base):
     def __hash__(self):
         return hash(self.flex_desc_index) + hash(self.targets)
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
         self.flex_desc_index = reader.read_uint32()
-        self.name = self.get_value('MDL').flex_names[self.flex_desc_index]
+        self.name = context.get_value('MDL').flex_names[self.flex_desc_index]
 
         self.targets = reader.read_fmt('4f')
         vert_count, vert_offset, self.partner_index = reader.read_fmt('3I')
@@ -1,7 +1,7 @@
 from enum import IntFlag
 
 from ....utilities.byte_io_mdl  import ByteIO
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 
 
 class StudioHDRFlags(IntFlag):
@@ -173,10 +173,10 @@ class Header(Base):
             fourcc = reader.read_fourcc()
         return fourcc == "IDST"
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         self.id = reader.read_fourcc()
         self.version, self.checksum = reader.read_fmt('ii')
-        self.store_value('mdl_version', self.version)
+        context.store_value('mdl_version', self.version)
         self.name = reader.read_ascii_string(64)
         self.file_size = reader.read_uint32()
 
@@ -1,7 +1,7 @@
 from typing import List
 
 from ....utilities.byte_io_mdl  import ByteIO
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from .flex import Flex
 
 
@@ -29,7 +29,7 @@ class Mesh(Base):
         self.vertex_data = MeshVertexData()
         self.flexes = []  # type: List[Flex]
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
 
         self.material_index, self.model_offset, self.vertex_count, self.vertex_index_start = reader.read_fmt('4I')
@@ -42,5 +42,5 @@ class Mesh(Base):
                 reader.seek(entry + flex_offset, 0)
                 for _ in range(flex_count):
                     flex = Flex()
-                    flex.read(reader)
+                    flex.read(reader, context)
                     self.flexes.append(flex)
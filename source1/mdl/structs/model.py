@@ -1,7 +1,7 @@
 from typing import List
 
 from ....utilities.byte_io_mdl import ByteIO
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from .mesh import Mesh
 from .eyeball import Eyeball
 
@@ -28,7 +28,7 @@ class Model(Base):
     def has_eyebals(self):
         return len(self.eyeballs) > 0
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
         self.name = reader.read_ascii_string(64)
         if not self.name:
@@ -58,5 +58,5 @@ class Model(Base):
             reader.seek(entry + mesh_offset, 0)
             for _ in range(mesh_count):
                 mesh = Mesh()
-                mesh.read(reader)
+                mesh.read(reader, context)
                 self.meshes.append(mesh)
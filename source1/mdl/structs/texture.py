@@ -1,5 +1,5 @@
 from ....utilities.byte_io_mdl  import ByteIO
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 
 
 class Material(Base):
@@ -12,7 +12,7 @@ class Material(Base):
         self.client_material_pointer = 0
         self.unused = []  # len 10
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
         self.name = reader.read_source1_string(entry)
         self.flags = reader.read_uint32()
@@ -20,4 +20,4 @@ class Material(Base):
         self.unused1 = reader.read_uint32()
         self.material_pointer = reader.read_uint32()
         self.client_material_pointer = reader.read_uint32()
-        reader.skip((10 if self.get_value('mdl_version') < 53 else 5) * 4)
+        reader.skip((10 if context.get_value('mdl_version') < 53 else 5) * 4)
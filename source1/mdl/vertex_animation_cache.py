@@ -1,3 +1,5 @@
+from typing import Dict, List, Tuple
+
 import numpy as np
 
 from ...source_shared.base import Base
@@ -7,9 +9,10 @@ from .structs.mesh import Mesh
 
 
 class VertexAnimationCache(Base):
+    """Sparse per-flex vertex deltas, stored as (vertex indices, deltas) pairs straight from the flex data."""
 
     def __init__(self, mdl: Mdl, vvd: Vvd):
-        self.vertex_cache = {}
+        self.vertex_cache: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {}
         self.mdl = mdl
         self.vvd = vvd
 
@@ -26,13 +29,23 @@ class VertexAnimationCache(Base):
                         self.process_mesh(mesh, model.vertex_offset)
         print("[Done] Pre-computing vertex animation cache")
 
-    def process_mesh(self, mesh: Mesh, vertex_offset, desired_lod=0):
+    def process_mesh(self, mesh: Mesh, vertex_offset):
         for flex in mesh.flexes:
-            if flex.name not in self.vertex_cache:
-                vertex_cache = self.vertex_cache[flex.name] = np.copy(self.vvd.lod_data[desired_lod]['vertex'])
-            else:
-                vertex_cache = self.vertex_cache[flex.name]
-            vertex_indices = flex.vertex_animations['index'].reshape(-1) + mesh.vertex_index_start + vertex_offset
-            vertex_cache[vertex_indices] = np.add(vertex_cache[vertex_indices], flex.vertex_animations['vertex_delta'])
-
-        pass
+            vertex_indices = flex.vertex_animations['index'].reshape(-1).astype(np.int64)
+            vertex_indices += mesh.vertex_index_start + vertex_offset
+            self.vertex_cache.setdefault(flex.name, []).append(
+                (vertex_indices, flex.vertex_animations['vertex_delta']))
+
+    def apply_flex(self, flex_name: str, vertices: np.ndarray, vertex_offset=0) -> np.ndarray:
+        """Adds deltas of a flex in place to vertices starting at vertex_offset.
+
+        Returns indices of touched vertices, so the caller can restore them before applying the next flex.
+        """
+        touched = []
+        for vertex_indices, deltas in self.vertex_cache.get(flex_name, []):
+            local_indices = vertex_indices - vertex_offset
+            mask = (local_indices >= 0) & (local_indices < len(vertices))
+            local_indices = local_indices[mask]
+            vertices[local_indices] = np.add(vertices[local_indices], deltas[mask])
+            touched.append(local_indices)
+        return np.concatenate(touched) if touched else np.zeros((0,), dtype=np.int64)
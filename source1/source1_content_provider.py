@@ -58,6 +58,9 @@ class GameinfoContentProvider(ContentProviderBase):
 
         return all_search_paths
 
+    def index_files(self):
+        return self.index_directory(self.modname_dir)
+
     def find_file(self, filepath: str, additional_dir=None,
                   extension=None):
         path = self.find_path(filepath, additional_dir, extension)
@@ -1,6 +1,6 @@
 from typing import List
 
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from ....utilities.byte_io_mdl  import ByteIO
 from .model import Model
 
@@ -9,7 +9,7 @@ class BodyPart(Base):
     def __init__(self):
         self.models = []  # type: List[Model]
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
         model_count, model_offset = reader.read_fmt('II')
 
@@ -17,5 +17,5 @@ class BodyPart(Base):
             reader.seek(entry + model_offset)
             for _ in range(model_count):
                 model = Model()
-                model.read(reader)
+                model.read(reader, context)
                 self.models.append(model)
@@ -1,6 +1,6 @@
 from typing import List
 
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from ....utilities.byte_io_mdl  import ByteIO
 from .mesh import Mesh
 
@@ -10,16 +10,18 @@ class ModelLod(Base):
         self.switchPoint = 0
         self.meshes = []  # type: List[Mesh]
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
         mesh_count = reader.read_uint32()
         mesh_offset = reader.read_uint32()
         self.switchPoint = reader.read_float()
+        lods = context.get_value('lods')
+        read_meshes = lods is None or self.lod in lods
         with reader.save_current_pos():
-            if mesh_offset > 0:
+            if mesh_offset > 0 and read_meshes:
                 reader.seek(entry + mesh_offset)
                 for _ in range(mesh_count):
                     mesh = Mesh()
-                    mesh.read(reader)
+                    mesh.read(reader, context)
                     self.meshes.append(mesh)
         return self
@@ -1,6 +1,6 @@
 from typing import List
 
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from ....utilities.byte_io_mdl  import ByteIO
 from .strip_group import StripGroup
 
@@ -11,7 +11,7 @@ class Mesh(Base):
         self.flags = 0
         self.strip_groups = []  # type: List[StripGroup]
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
         strip_group_count, strip_group_offset = reader.read_fmt('2I')
         assert strip_group_offset < reader.size()
@@ -21,5 +21,5 @@ class Mesh(Base):
                 reader.seek(entry + strip_group_offset)
                 for _ in range(strip_group_count):
                     strip_group = StripGroup()
-                    strip_group.read(reader)
+                    strip_group.read(reader, context)
                     self.strip_groups.append(strip_group)
@@ -1,6 +1,6 @@
 from typing import List
 
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from ....utilities.byte_io_mdl import ByteIO
 
 from .lod import ModelLod
@@ -10,7 +10,7 @@ class Model(Base):
     def __init__(self):
         self.model_lods = []  # type: List[ModelLod]
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         entry = reader.tell()
         lod_count, lod_offset = reader.read_fmt('ii')
         with reader.save_current_pos():
@@ -18,5 +18,5 @@ class Model(Base):
                 reader.seek(entry + lod_offset)
                 for lod_id in range(lod_count):
                     model_lod = ModelLod(lod_id)
-                    model_lod.read(reader)
+                    model_lod.read(reader, context)
                     self.model_lods.append(model_lod)
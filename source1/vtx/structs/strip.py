@@ -1,6 +1,6 @@
 from enum import IntFlag
 
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from ....utilities.byte_io_mdl import ByteIO
 
 
@@ -23,7 +23,7 @@ class Strip(Base):
         self.topology_indices_count = 0
         self.topology_offset = 0
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
         (self.index_count,
          self.index_mesh_offset,
          self.vertex_count,
@@ -31,7 +31,7 @@ class Strip(Base):
          self.bone_count) = reader.read_fmt('4IH')
         self.flags = StripHeaderFlags(reader.read_uint8())
         self.bone_state_change_count, self.bone_state_change_offset = reader.read_fmt('2I')
-        if self.get_value('extra8'):
+        if context.get_value('extra8'):
             self.topology_indices_count = reader.read_int32()
             self.topology_offset = reader.read_int32()
             assert self.topology_offset < reader.size()
@@ -3,7 +3,7 @@ from typing import List
 
 import numpy as np
 
-from ....source_shared.base import Base
+from ....source_shared.base import Base, ParseContext
 from ....utilities.byte_io_mdl import ByteIO
 from .strip import Strip
 
@@ -34,7 +34,7 @@ class StripGroup(Base):
         self.strips: List[Strip] = []
         self.topology = []
 
-    def read(self, reader: ByteIO):
+    def read(self, reader: ByteIO, context: ParseContext):
 
         entry = reader.tell()
         vertex_count = reader.read_uint32()
@@ -48,7 +48,7 @@ class StripGroup(Base):
         assert strip_offset < reader.size()
         assert index_offset < reader.size()
         self.flags = StripGroupFlags(reader.read_uint8())
-        if self.get_value('extra8'):
+        if context.get_value('extra8'):
             topology_indices_count = reader.read_uint32()
             topology_offset = reader.read_uint32()
 
@@ -60,7 +60,7 @@ class StripGroup(Base):
             reader.seek(entry + strip_offset)
             for _ in range(strip_count):
                 strip = Strip()
-                strip.read(reader)
+                strip.read(reader, context)
                 self.strips.append(strip)
             # reader.seek(entry + topology_offset)
             # self.topology = (
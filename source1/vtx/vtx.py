@@ -1,8 +1,8 @@
 import struct
-from typing import List
+from typing import List, Optional, Iterable
 
 from .structs.material_replacement_list import MaterialReplacementList
-from ...source_shared.base import Base
+from ...source_shared.base import Base, ParseContext
 from ...utilities.byte_io_mdl import ByteIO
 
 from .structs.header import Header
@@ -16,23 +16,29 @@ class Vtx(Base):
         self.body_parts = []  # type: List[BodyPart]
         self.material_replacement_lists = []  # type: List[MaterialReplacementList]
 
-    def read(self):
+    def read(self, lods: Optional[Iterable[int]] = None):
+        """Parses the file, meshes are only read for LODs in lods (all LODs if None).
+
+        LODs past the last one the file has are clamped to it.
+        """
         self.header.read(self.reader)
+        if lods is not None:
+            lods = {min(lod, self.header.lod_count - 1) for lod in lods}
 
+        context = ParseContext(extra8=False, lods=lods)
         try:
-            self.store_value('extra8', False)
             self.reader.seek(self.header.body_part_offset)
             for _ in range(self.header.body_part_count):
                 body_part = BodyPart()
-                body_part.read(self.reader)
+                body_part.read(self.reader, context)
                 self.body_parts.append(body_part)
         except (struct.error, AssertionError):
             self.reader.seek(self.header.body_part_offset)
             self.body_parts.clear()
-            self.store_value('extra8', True)
+            context.store_value('extra8', True)
             for _ in range(self.header.body_part_count):
                 body_part = BodyPart()
-                body_part.read(self.reader)
+                body_part.read(self.reader, context)
                 self.body_parts.append(body_part)
 
         self.reader.seek(self.header.material_replacement_list_offset)
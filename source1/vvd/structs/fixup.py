@@ -1,7 +1,11 @@
+import numpy as np
+
 from ....utilities.byte_io_mdl  import ByteIO
 
 
 class Fixup:
+    dtype = np.dtype([('lod_index', np.uint32), ('vertex_index', np.uint32), ('vertex_count', np.uint32)])
+
     def __init__(self):
         self.lod_index = 0
         self.vertex_index = 0
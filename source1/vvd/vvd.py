@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import Dict, Optional, Iterable, Mapping
 
 import numpy as np
 
@@ -8,6 +8,29 @@ from ...source_shared.base import Base
 from ...utilities.byte_io_mdl import ByteIO
 
 
+class LodData(Mapping):
+    """LOD number to vertex array mapping, arrays are resolved on first access and cached."""
+
+    def __init__(self, vvd: 'Vvd', lods: Iterable[int]):
+        self._vvd = vvd
+        self._lods = sorted(lods)
+        self._cache: Dict[int, np.ndarray] = {}
+
+    def __getitem__(self, lod: int) -> np.ndarray:
+        lod_data = self._cache.get(lod, None)
+        if lod_data is None:
+            if lod not in self._lods:
+                raise KeyError(lod)
+            lod_data = self._cache[lod] = self._vvd.build_lod(lod)
+        return lod_data
+
+    def __iter__(self):
+        return iter(self._lods)
+
+    def __len__(self):
+        return len(self._lods)
+
+
 class Vvd(Base):
     vertex_t = np.dtype([('weight', np.float32, 3),
                          ('bone_id', np.uint8, 3),
@@ -21,39 +44,47 @@ class Vvd(Base):
         self.reader = ByteIO(filepath)
         self.header = Header()
         self._vertices = np.array([], dtype=self.vertex_t)
-        self.fixups = []  # type:List[Fixup]
-        self.lod_data = {}  # type:Dict[int,np.ndarray]
+        self.fixups = np.array([], dtype=Fixup.dtype)
+        self.lod_data: Mapping[int, np.ndarray] = {}
 
-    def read(self):
+    def read(self, lods: Optional[Iterable[int]] = None):
+        """Parses the file, vertex arrays are only available for LODs in lods (all LODs if None).
+
+        LODs past the last one the file has are clamped to it. Arrays are built on first access to lod_data.
+        """
         self.header.read(self.reader)
+        if lods is None:
+            lods = range(self.header.lod_count)
+        else:
+            lods = {min(lod, self.header.lod_count - 1) for lod in lods}
 
         self.reader.seek(self.header.vertex_data_offset)
         self._vertices = np.frombuffer(self.reader.read(self.vertex_t.itemsize * self.header.lod_vertex_count[0]),
                                        dtype=self.vertex_t)
 
-        for n, count in enumerate(self.header.lod_vertex_count[:self.header.lod_count]):
-            self.lod_data[n] = np.zeros((count,), dtype=self.vertex_t)
-
         self.reader.seek(self.header.fixup_table_offset)
-        for _ in range(self.header.fixup_count):
-            fixup = Fixup()
-            fixup.read(self.reader)
-            self.fixups.append(fixup)
-
-        if self.header.fixup_count:
-            lod_offsets = np.zeros(len(self.lod_data), dtype=np.uint32)
-            for lod_id in range(self.header.lod_count):
-                for fixup in self.fixups:
-                    if fixup.lod_index >= lod_id:
-                        lod_data = self.lod_data[lod_id]
-                        assert fixup.vertex_index + fixup.vertex_count <= self._vertices.size, \
-                            f"{fixup.vertex_index + fixup.vertex_count}>{self._vertices.size}"
-                        lod_offset = lod_offsets[lod_id]
-                        vertex_index = fixup.vertex_index
-                        vertex_count = fixup.vertex_count
-                        lod_data[lod_offset:lod_offset + vertex_count] = self._vertices[
-                                                                         vertex_index:vertex_index + vertex_count]
-                        lod_offsets[lod_id] += fixup.vertex_count
+        self.fixups = np.frombuffer(self.reader.read(Fixup.dtype.itemsize * self.header.fixup_count), Fixup.dtype)
+        if self.fixups.size:
+            fixup_ends = self.fixups['vertex_index'].astype(np.int64) + self.fixups['vertex_count']
+            assert fixup_ends.max() <= self._vertices.size, f"{fixup_ends.max()}>{self._vertices.size}"
 
-        else:
-            self.lod_data[0][:] = self._vertices[:]
+        self.lod_data = LodData(self, lods)
+
+    def build_lod(self, lod: int) -> np.ndarray:
+        """Gathers vertices of a LOD with a single indexing operation. Without fixups it's a view of the file data."""
+        vertex_count = self.header.lod_vertex_count[lod]
+        if not self.fixups.size:
+            # Without fixups every LOD uses the vertices as they are
+            return self._vertices[:vertex_count]
+
+        fixups = self.fixups[self.fixups['lod_index'] >= lod]
+        starts = fixups['vertex_index'].astype(np.int64)
+        counts = fixups['vertex_count'].astype(np.int64)
+        total = int(counts.sum())
+        offsets = np.cumsum(counts) - counts
+        indices = np.repeat(starts - offsets, counts) + np.arange(total, dtype=np.int64)
+        if total == vertex_count:
+            return self._vertices[indices]
+        lod_data = np.zeros((vertex_count,), dtype=self.vertex_t)
+        lod_data[:min(total, vertex_count)] = self._vertices[indices[:vertex_count]]
+        return lod_data
@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 
 import bpy
-from bpy.props import StringProperty, BoolProperty, CollectionProperty, EnumProperty, FloatProperty
+from bpy.props import StringProperty, BoolProperty, CollectionProperty, EnumProperty, FloatProperty, IntProperty
 
 from .bpy_utilities.material_loader.material_loader import Source1MaterialLoader
 from .bpy_utilities.utils import get_new_unique_collection
@@ -31,6 +31,8 @@ class MDLImport_OT_operator(bpy.types.Operator):
     create_flex_drivers: BoolProperty(name="Create drivers for flexes", default=False, subtype='UNSIGNED')
     bodygroup_grouping: BoolProperty(name="Group meshes by bodygroup", default=True, subtype='UNSIGNED')
     import_textures: BoolProperty(name="Import materials", default=True, subtype='UNSIGNED')
+    desired_lod: IntProperty(name="LOD", default=0, min=0, max=7)
+    import_all_lods: BoolProperty(name="Import all LODs", default=False, subtype='UNSIGNED')
     scale: FloatProperty(name="World scale", default=HAMMER_UNIT_TO_METERS, precision=6)
     filter_glob: StringProperty(default="*.mdl", options={'HIDDEN'})
 
@@ -52,7 +54,8 @@ class MDLImport_OT_operator(bpy.types.Operator):
             vvd_file = backwalk_file_resolver(directory, mdl_path.stem + '.vvd')
 
             model_container = import_model(mdl_path.open('rb'), vvd_file.open('rb'), vtx_file.open('rb'), self.scale,
-                                           self.create_flex_drivers)
+                                           self.create_flex_drivers, desired_lod=self.desired_lod,
+                                           import_all_lods=self.import_all_lods)
 
             put_into_collections(model_container, mdl_path.stem, bodygroup_grouping=self.bodygroup_grouping)
 
@@ -86,6 +89,7 @@ class BSPImport_OT_operator(bpy.types.Operator):
     filepath: StringProperty(subtype="FILE_PATH")
     scale: FloatProperty(name="World scale", default=HAMMER_UNIT_TO_METERS, precision=6)
     import_textures: BoolProperty(name="Import materials", default=True, subtype='UNSIGNED')
+    instance_static_props: BoolProperty(name="Import static props as instances", default=False, subtype='UNSIGNED')
 
     filter_glob: StringProperty(default="*.bsp", options={'HIDDEN'})
 
@@ -98,11 +102,12 @@ class BSPImport_OT_operator(bpy.types.Operator):
 
         bsp_map.load_disp()
         bsp_map.load_entities()
-        bsp_map.load_static_props()
+        bsp_map.load_static_props(self.instance_static_props)
         bsp_map.load_overlays()
         # bsp_map.load_detail_props()
         if self.import_textures:
             bsp_map.load_materials()
+        bsp_map.close()
 
         return {'FINISHED'}
 
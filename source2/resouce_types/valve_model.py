@@ -15,7 +15,8 @@ from ..common import convert_normals
 from ..source2 import ValveCompiledFile
 import numpy as np
 
-from ...bpy_utilities.utils import get_material, get_or_create_collection, get_new_unique_collection
+from ...bpy_utilities.utils import get_material, get_or_create_collection, get_new_unique_collection, \
+    fill_mesh, add_uv_layer
 from ...source_shared.content_manager import ContentManager
 
 
@@ -195,9 +196,8 @@ class ValveCompiledModel(ValveCompiledFile):
                 if normals.dtype.char == 'B' and normals.shape[1] == 4:
                     normals = convert_normals(normals)
 
-                mesh.from_pydata(used_vertices, [],
-                                 index_buffer.indexes[start_index:start_index + index_count].tolist())
-                mesh.update()
+                vertex_indices = index_buffer.indexes[start_index:start_index + index_count].ravel()
+                fill_mesh(mesh, used_vertices, vertex_indices, 3)
                 n = 0
                 for attrib in vertex_buffer.attributes:
                     if 'TEXCOORD' in attrib.name.upper():
@@ -207,11 +207,7 @@ class ValveCompiledModel(ValveCompiledFile):
                         if invert_uv:
                             uv_layer[:, 1] = np.subtract(1, uv_layer[:, 1])
 
-                        uv_data = mesh.uv_layers.new(name=attrib.name).data
-                        vertex_indices = np.zeros((len(mesh.loops, )), dtype=np.uint32)
-                        mesh.loops.foreach_get('vertex_index', vertex_indices)
-                        new_uv_data = uv_layer[used_range][vertex_indices]
-                        uv_data.foreach_set('uv', new_uv_data.flatten())
+                        add_uv_layer(mesh, uv_layer[used_range][vertex_indices], attrib.name)
                         n += 1
                 if armature:
                     model_skeleton = data_block.data['m_modelSkeleton']
@@ -452,7 +448,6 @@ class ValveCompiledModel(ValveCompiledFile):
             print(f'Loading {material}')
             file = self.available_resources.get(material, None)
             if file:
-                file = content_manager.find_file(file)
-                if file:  # duh
-                    material = ValveCompiledMaterial(file)
+                material = content_manager.load_asset(file, ValveCompiledMaterial)
+                if material:  # duh
                     material.load()
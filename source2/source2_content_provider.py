@@ -58,6 +58,9 @@ class GameinfoContentProvider(ContentProviderBase):
                 all_search_paths.append(vpk_file)
         return all_search_paths
 
+    def index_files(self):
+        return self.index_directory(self.modname_dir)
+
     def find_file(self, filepath: str, additional_dir=None,
                   extension=None):
         filepath = Path(str(filepath).strip("\\/"))
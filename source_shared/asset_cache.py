@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..utilities.singleton import SingletonMeta
+
+
+class AssetCache(metaclass=SingletonMeta):
+    """Process-wide LRU cache of parsed assets, bounded by approximate size in bytes.
+
+    Sizes are supplied by the caller, usually the size of the file the asset was parsed from.
+    Cached objects are shared between importers and must be treated as read-only.
+    """
+
+    def __init__(self, max_size=512 * 1024 * 1024):
+        self.max_size = max_size
+        self.total_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item: Optional[Tuple[Any, int]] = self._entries.get(key, None)
+        if item is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def put(self, key: Hashable, value: Any, size: int):
+        if key in self._entries:
+            self.total_size -= self._entries.pop(key)[1]
+        if size > self.max_size:
+            return
+        self._entries[key] = value, size
+        self.total_size += size
+        while self.total_size > self.max_size:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.total_size -= evicted_size
+            self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], size: int):
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.put(key, value, size)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.total_size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'size': self.total_size, 'max_size': self.max_size,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,10 +1,18 @@
-class Base:
-    storage = {}
+class ParseContext:
+    """Parse state of a single file, passed down to the struct readers that need it.
+
+    Every file gets its own context, so several files can be parsed at the same time.
+    """
+
+    def __init__(self, **values):
+        self._values = values
 
-    @classmethod
-    def store_value(cls, key, value):
-        cls.storage[key] = value
+    def store_value(self, key, value):
+        self._values[key] = value
 
-    @classmethod
-    def get_value(cls, key):
-        return cls.storage.get(key, None)
\ No newline at end of file
+    def get_value(self, key):
+        return self._values.get(key, None)
+
+
+class Base:
+    pass
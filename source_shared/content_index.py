@@ -0,0 +1,186 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .content_provider_base import ContentProviderBase
+from ..utilities.path_utilities import path_hash
+
+
+class ContentProviderDict(dict):
+    """Provider registry that counts modifications, so lookup caches built from it know when to reset."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self._version_lock = threading.Lock()
+        self._loaded: List[ContentProviderBase] = []
+
+    def touch(self):
+        """Marks the registry as changed."""
+        with self._version_lock:
+            self.version += 1
+
+    def mark_loaded(self, provider: ContentProviderBase):
+        """Queues a provider that finished loading in the background to be merged into the content index.
+
+        Lookups wait for providers that are still loading, so this doesn't invalidate anything resolved before.
+        """
+        with self._version_lock:
+            self._loaded.append(provider)
+
+    def take_loaded(self) -> List[ContentProviderBase]:
+        with self._version_lock:
+            loaded, self._loaded = self._loaded, []
+        return loaded
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.touch()
+
+    def clear(self):
+        super().clear()
+        self.touch()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.touch()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.touch()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.touch()
+
+
+class ContentIndex:
+    """Maps path hashes to the position of the first provider (in priority order) that has the file."""
+
+    def __init__(self, content_providers: Dict[str, ContentProviderBase], previous: Optional['ContentIndex'] = None):
+        self.version = getattr(content_providers, 'version', 0)
+        self.providers: List[Tuple[str, ContentProviderBase]] = list(content_providers.items())
+        self.unindexed: List[int] = []
+        # id(provider) -> (provider, hashes), kept so a rebuild doesn't have to list every provider again
+        self._provider_hashes: Dict[int, Tuple[ContentProviderBase, Optional[np.ndarray]]] = {}
+
+        all_hashes = []
+        all_positions = []
+        for position, (_, provider) in enumerate(self.providers):
+            hashes = self._get_provider_hashes(provider, previous)
+            if hashes is None:
+                self.unindexed.append(position)
+                continue
+            all_hashes.append(hashes)
+            all_positions.append(np.full(len(hashes), position, np.uint32))
+
+        if all_hashes:
+            hashes = np.concatenate(all_hashes)
+            positions = np.concatenate(all_positions)
+            order = np.lexsort((positions, hashes))
+            hashes = hashes[order]
+            positions = positions[order]
+            first = np.ones(len(hashes), bool)
+            first[1:] = hashes[1:] != hashes[:-1]
+            self.hashes = hashes[first]
+            self.positions = positions[first]
+        else:
+            self.hashes = np.zeros(0, np.uint64)
+            self.positions = np.zeros(0, np.uint32)
+
+    def add_provider(self, provider: ContentProviderBase):
+        """Merges hashes of a provider that wasn't indexed yet, without rebuilding the whole index."""
+        position = next((n for n in self.unindexed if self.providers[n][1] is provider), None)
+        if position is None:
+            return
+        hashes = self._get_provider_hashes(provider, None)
+        if hashes is None:
+            return
+        self.unindexed.remove(position)
+        hashes = np.unique(hashes)
+
+        insert_at = np.searchsorted(self.hashes, hashes)
+        found = insert_at < len(self.hashes)
+        found[found] = self.hashes[insert_at[found]] == hashes[found]
+        positions = self.positions.copy()
+        positions[insert_at[found]] = np.minimum(positions[insert_at[found]], position)
+        new = ~found
+        self.hashes = np.insert(self.hashes, insert_at[new], hashes[new])
+        self.positions = np.insert(positions, insert_at[new], np.uint32(position))
+
+    def _get_provider_hashes(self, provider, previous: Optional['ContentIndex']):
+        if previous is not None:
+            cached = previous._provider_hashes.get(id(provider), None)
+            # Providers without an index may still be loading, so only known hashes are reused
+            if cached is not None and cached[0] is provider and cached[1] is not None:
+                self._provider_hashes[id(provider)] = cached
+                return cached[1]
+        index_files = getattr(provider, 'index_files', None)
+        hashes = index_files() if index_files is not None else None
+        if hashes is not None:
+            hashes = np.asarray(hashes, np.uint64)
+        self._provider_hashes[id(provider)] = provider, hashes
+        return hashes
+
+    def find_position(self, path_key: str) -> int:
+        target = np.uint64(path_hash(path_key))
+        index = int(np.searchsorted(self.hashes, target))
+        if index < len(self.hashes) and self.hashes[index] == target:
+            return int(self.positions[index])
+        return -1
+
+    def get_candidates(self, path_key: str) -> List[int]:
+        """Provider positions worth asking for path_key, in priority order.
+
+        Providers that can't list their content are always included, indexed providers after the first hit
+        are kept as fallback in case the hit turns out to be a hash collision or a stale entry.
+        """
+        position = self.find_position(path_key)
+        if position == -1:
+            return self.unindexed
+        return [pos for pos in self.unindexed if pos < position] + list(range(position, len(self.providers)))
+
+
+class MissingFileCache:
+    """Bounded LRU set of lookups that no provider could resolve."""
+
+    def __init__(self, max_size=8192):
+        self.max_size = max_size
+        self.version = None
+        self._missing: OrderedDict = OrderedDict()
+
+    def sync(self, version):
+        if version != self.version:
+            self._missing.clear()
+            self.version = version
+
+    def add(self, key):
+        self._missing[key] = None
+        self._missing.move_to_end(key)
+        if len(self._missing) > self.max_size:
+            self._missing.popitem(last=False)
+
+    def clear(self):
+        self._missing.clear()
+
+    def __contains__(self, key):
+        if key in self._missing:
+            self._missing.move_to_end(key)
+            return True
+        return False
+
+    def __len__(self):
+        return len(self._missing)
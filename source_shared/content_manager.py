@@ -1,10 +1,15 @@
+import io
+from functools import partial
 from pathlib import Path
-from typing import Union, Dict
+from typing import Union, Dict, Iterator, Tuple, Optional, Iterable, List, BinaryIO, Callable, TypeVar
 
 from ..bpy_utilities.logging import BPYLoggingManager
+from ..source_shared.asset_cache import AssetCache
+from ..source_shared.content_index import ContentIndex, ContentProviderDict, MissingFileCache
 from ..source_shared.non_source_sub_manager import NonSourceContentProvider
 from ..source_shared.content_provider_base import ContentProviderBase
 from ..source_shared.vpk_sub_manager import VPKContentProvider
+from ..source_shared.vpk.structs import Entry
 from ..source1.source1_content_provider import GameinfoContentProvider as Source1GameinfoContentProvider
 from ..source2.source2_content_provider import GameinfoContentProvider as Source2GameinfoContentProvider
 from ..utilities.path_utilities import get_mod_path
@@ -13,13 +18,27 @@ from ..utilities.singleton import SingletonMeta
 log_manager = BPYLoggingManager()
 logger = log_manager.get_logger('content_manager')
 
+T = TypeVar('T')
+
 
 class ContentManager(metaclass=SingletonMeta):
     def __init__(self):
-        self.content_providers: Dict[str, ContentProviderBase] = {}
+        self.content_providers: Dict[str, ContentProviderBase] = ContentProviderDict()
+        self._content_index: Optional[ContentIndex] = None
+        self._missing_files = MissingFileCache()
+        self._prefetched: Dict[str, Tuple[ContentProviderBase, BinaryIO]] = {}
+        self._resolved: Dict[str, ContentProviderBase] = {}
+        self._lookup_version = None
         self._titanfall_mode = False
 
     def scan_for_content(self, source_game_path: Union[str, Path]):
+        version = self.content_providers.version
+        self._scan_for_content(source_game_path)
+        if self.content_providers.version != version:
+            # New providers may shadow files that were already parsed
+            AssetCache().clear()
+
+    def _scan_for_content(self, source_game_path: Union[str, Path]):
 
         source_game_path = Path(source_game_path)
         if source_game_path.suffix == '.vpk':
@@ -30,8 +49,7 @@ class ContentManager(metaclass=SingletonMeta):
                 return
             vpk_path = source_game_path
             if vpk_path.exists():
-                sub_manager = VPKContentProvider(vpk_path)
-                self.content_providers[f'{source_game_path.parent.stem}_{source_game_path.stem}'] = sub_manager
+                self._register_vpk(f'{source_game_path.parent.stem}_{source_game_path.stem}', vpk_path)
                 logger.info(f'Registered sub manager for {source_game_path.parent.stem}_{source_game_path.stem}')
                 return
 
@@ -47,37 +65,42 @@ class ContentManager(metaclass=SingletonMeta):
                 self.content_providers[root_path.stem] = sub_manager
                 logger.info(f'Registered sub manager for {root_path.stem}')
                 for mod in sub_manager.get_search_paths():
-                    self.scan_for_content(mod)
+                    self._scan_for_content(mod)
             gameinfos = root_path.glob('*gameinfo*.gi')
             for gameinfo in gameinfos:
                 sub_manager = Source2GameinfoContentProvider(gameinfo)
                 self.content_providers[root_path.stem] = sub_manager
                 logger.info(f'Registered sub manager for {root_path.stem}')
                 for mod in sub_manager.get_search_paths():
-                    self.scan_for_content(mod)
+                    self._scan_for_content(mod)
         elif 'workshop' in root_path.name:
             sub_manager = NonSourceContentProvider(root_path)
             self.content_providers[root_path.stem] = sub_manager
             logger.info(f'Registered sub manager for {root_path.stem}')
             for mod in root_path.parent.iterdir():
                 if mod.is_dir():
-                    self.scan_for_content(mod)
+                    self._scan_for_content(mod)
         elif 'download' in root_path.name:
             sub_manager = NonSourceContentProvider(root_path)
             self.content_providers[root_path.stem] = sub_manager
             logger.info(f'Registered sub manager for {root_path.stem}')
-            self.scan_for_content(root_path.parent)
+            self._scan_for_content(root_path.parent)
         else:
             if root_path.is_dir():
                 sub_manager = NonSourceContentProvider(root_path)
                 self.content_providers[root_path.stem] = sub_manager
                 logger.info(f'Registered sub manager for {source_game_path.stem}')
 
+    def _register_vpk(self, name: str, vpk_path: Path):
+        # The slot is taken right away to keep search path priority, the directory tree is read in background
+        sub_manager = VPKContentProvider(vpk_path, load_async=True)
+        self.content_providers[name] = sub_manager
+        sub_manager.add_loaded_callback(partial(self.content_providers.mark_loaded, sub_manager))
+
     def deserialize(self, data: Dict[str, str]):
         for name, path in data.items():
             if path.endswith('.vpk'):
-                sub_manager = VPKContentProvider(Path(path))
-                self.content_providers[name] = sub_manager
+                self._register_vpk(name, Path(path))
             elif path.endswith('.txt'):
                 sub_manager = Source1GameinfoContentProvider(Path(path))
                 if sub_manager.data.get('game',None) == 'Titanfall':
@@ -91,6 +114,7 @@ class ContentManager(metaclass=SingletonMeta):
                 bsp = open_bsp(path)
                 bsp.parse()
                 pak_lump = bsp.get_lump('LUMP_PAK')
+                bsp.close()
                 if pak_lump:
                     self.content_providers[name] = pak_lump
             else:
@@ -110,38 +134,190 @@ class ContentManager(metaclass=SingletonMeta):
             return ContentManager.is_source_mod(get_mod_path(path), True)
         return False, path
 
-    def find_file(self, filepath: str, additional_dir=None, extension=None, *, silent=False):
+    def get_content_index(self) -> ContentIndex:
+        index = self._content_index
+        loaded = self.content_providers.take_loaded()
+        if index is None or index.version != self.content_providers.version:
+            index = self._content_index = ContentIndex(self.content_providers, index)
+        else:
+            for provider in loaded:
+                index.add_provider(provider)
+        return index
+
+    def _iter_content_providers(self, filepath: Path) -> Iterator[Tuple[str, ContentProviderBase]]:
+        index = self.get_content_index()
+        for position in index.get_candidates(filepath.as_posix().lower()):
+            yield index.providers[position]
+
+    def _sync_lookup_caches(self):
+        version = self.content_providers.version
+        self._missing_files.sync(version)
+        if self._lookup_version != version:
+            self._prefetched.clear()
+            self._resolved.clear()
+            self._lookup_version = version
 
+    @staticmethod
+    def _normalize_path(filepath, additional_dir=None, extension=None) -> Path:
         new_filepath = Path(str(filepath).replace('\\', '/').strip('/'))
         if additional_dir:
             new_filepath = Path(additional_dir, new_filepath)
         if extension:
             new_filepath = new_filepath.with_suffix(extension)
-        if not silent:
-            logger.info(f'Requesting {new_filepath} file')
-        for mod, submanager in self.content_providers.items():
+        return new_filepath
+
+    def prefetch(self, filepaths: Iterable[Union[str, Path, Tuple[Union[str, Path], ...]]],
+                 additional_dir=None, extension=None):
+        """Reads a batch of files ahead of time, grouped per VPK archive and sorted by offset.
+
+        An item can be a tuple of alternative paths, only the first one that is found gets read.
+        Files that resolve to a VPK are kept in memory until the next find_file call for them
+        or until clear_prefetched(), everything else is left to be resolved by find_file as usual.
+        """
+        self._sync_lookup_caches()
+        requests: Dict[int, Tuple[VPKContentProvider, List[Tuple[str, Entry]]]] = {}
+        for alternatives in filepaths:
+            if not isinstance(alternatives, tuple):
+                alternatives = alternatives,
+            for filepath in alternatives:
+                new_filepath = self._normalize_path(filepath, additional_dir, extension)
+                path_key = new_filepath.as_posix().lower()
+                if path_key in self._prefetched:
+                    break
+                if ('file', path_key) in self._missing_files:
+                    continue
+                _, submanager = next(self._iter_content_providers(new_filepath), (None, None))
+                if submanager is None:
+                    continue
+                if not isinstance(submanager, VPKContentProvider) or submanager.is_loading:
+                    # Can't tell if the file is there without opening it, leave it to find_file
+                    break
+                entry = submanager.vpk_archive.find_file(new_filepath)
+                if entry is None:
+                    continue
+                requests.setdefault(id(submanager), (submanager, []))[1].append((path_key, entry))
+                break
+
+        for submanager, files in requests.values():
+            readers = submanager.vpk_archive.read_files([entry for _, entry in files])
+            for path_key, entry in files:
+                self._prefetched[path_key] = submanager, readers[entry.file_name]
+        logger.debug(f'Prefetched {sum(len(files) for _, files in requests.values())} files')
+
+    def clear_prefetched(self):
+        self._prefetched.clear()
+
+    def _find_file(self, new_filepath: Path, silent=False) -> Tuple[Optional[ContentProviderBase], Optional[BinaryIO]]:
+        self._sync_lookup_caches()
+        path_key = new_filepath.as_posix().lower()
+        submanager, prefetched = self._prefetched.pop(path_key, (None, None))
+        if prefetched is not None:
+            self._resolved[path_key] = submanager
+            return submanager, prefetched
+        lookup_key = 'file', path_key
+        if lookup_key in self._missing_files:
+            return None, None
+        for mod, submanager in self._iter_content_providers(new_filepath):
             file = submanager.find_file(new_filepath)
             if file is not None:
                 if not silent:
                     logger.debug(f'Found in {mod}!')
-                return file
-        return None
+                self._resolved[path_key] = submanager
+                return submanager, file
+        self._missing_files.add(lookup_key)
+        return None, None
+
+    def find_file(self, filepath: str, additional_dir=None, extension=None, *, silent=False):
+
+        new_filepath = self._normalize_path(filepath, additional_dir, extension)
+        if not silent:
+            logger.info(f'Requesting {new_filepath} file')
+        _, file = self._find_file(new_filepath, silent)
+        return file
+
+    def load_asset(self, filepath: Union[str, Path], loader: Callable[[BinaryIO], T],
+                   additional_dir=None, extension=None, *, silent=False) -> Optional[T]:
+        """Finds a file and parses it with loader, sharing the result through AssetCache.
+
+        The cache is keyed by the loader, the provider that serves the file and the path (plus size and mtime
+        for loose files), so repeated requests for an already parsed asset skip both I/O and parsing.
+        The loader gets an in-memory copy of the file, the file itself is closed right away.
+        """
+        new_filepath = self._normalize_path(filepath, additional_dir, extension)
+        if not silent:
+            logger.info(f'Requesting {new_filepath} asset')
+        self._sync_lookup_caches()
+        path_key = new_filepath.as_posix().lower()
+        asset_cache = AssetCache()
+        loader_name = self._loader_key(loader)
+
+        file = None
+        submanager = self._resolved.get(path_key, None)
+        if submanager is None:
+            submanager, file = self._find_file(new_filepath, silent)
+            if file is None:
+                return None
+        # Providers are recreated by deserialize(), so they are identified by their source file rather than id()
+        cache_key = (loader_name, type(submanager).__name__, str(getattr(submanager, 'filepath', '')), path_key,
+                     self._file_stamp(submanager, new_filepath))
+        asset = asset_cache.get(cache_key)
+        if asset is not None:
+            if file is not None:
+                file.close()
+            return asset
+
+        if file is None:
+            _, file = self._find_file(new_filepath, silent)
+            if file is None:
+                return None
+        try:
+            data = file.read()
+        finally:
+            file.close()
+        asset = loader(io.BytesIO(data))
+        if asset is not None:
+            asset_cache.put(cache_key, asset, len(data))
+        return asset
+
+    @staticmethod
+    def _file_stamp(submanager: ContentProviderBase, filepath: Path) -> Optional[Tuple[int, int]]:
+        """Size and mtime of a loose file, so files changed on disk are not served from the cache."""
+        find_path = getattr(submanager, 'find_path', None)
+        if find_path is None or isinstance(submanager, VPKContentProvider):
+            return None
+        try:
+            path = find_path(filepath)
+            if path is None:
+                return None
+            stat = Path(path).stat()
+        except (NotImplementedError, OSError):
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _loader_key(loader: Callable):
+        if isinstance(loader, partial):
+            return (ContentManager._loader_key(loader.func), tuple(map(repr, loader.args)),
+                    tuple(sorted((key, repr(value)) for key, value in loader.keywords.items())))
+        return getattr(loader, '__qualname__', repr(loader))
 
     def find_path(self, filepath: str, additional_dir=None, extension=None, *, silent=False):
-        new_filepath = Path(str(filepath).replace('\\', '/').strip('/'))
-        if additional_dir:
-            new_filepath = Path(additional_dir, new_filepath)
-        if extension:
-            new_filepath = new_filepath.with_suffix(extension)
+        new_filepath = self._normalize_path(filepath, additional_dir, extension)
         if not silent:
             logger.info(f'Requesting {new_filepath} file')
-        for mod, submanager in self.content_providers.items():
+        self._sync_lookup_caches()
+        lookup_key = 'path', new_filepath.as_posix().lower()
+        if lookup_key in self._missing_files:
+            return None
+        for mod, submanager in self._iter_content_providers(new_filepath):
             file = submanager.find_path(new_filepath)
             if file is not None:
                 if not silent:
                     logger.debug(f'Found in {mod}!')
                 return file
+        self._missing_files.add(lookup_key)
         return None
+
     def find_texture(self, filepath, *, silent=False):
         return self.find_file(filepath, 'materials', extension='.vtf', silent=silent)
 
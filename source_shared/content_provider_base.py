@@ -1,4 +1,10 @@
+import os
 from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from ..utilities.path_utilities import path_hashes
 
 
 class ContentProviderBase:
@@ -12,6 +18,26 @@ class ContentProviderBase:
     def find_path(self, filepath: str):
         raise NotImplementedError('Implement me!')
 
+    @property
+    def is_loading(self) -> bool:
+        return False
+
+    def wait_until_loaded(self):
+        pass
+
+    def index_files(self) -> Optional[np.ndarray]:
+        """Returns path hashes of every file this provider can serve, or None if content can't be listed."""
+        return None
+
+    @staticmethod
+    def index_directory(root: Path) -> np.ndarray:
+        paths = []
+        for directory, _, files in os.walk(root):
+            relative = Path(directory).relative_to(root).as_posix().lower()
+            prefix = '' if relative == '.' else relative + '/'
+            paths.extend(prefix + file.lower() for file in files)
+        return path_hashes(paths)
+
     @property
     def steam_id(self):
         return 0
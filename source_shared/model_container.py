@@ -28,3 +28,4 @@ class Source1ModelContainer(ModelContainer):
         self.vvd: Vvd = vvd
         self.vtx: Vtx = vtx
         self.attachments = []
+        self.lod_objects: Dict[int, List[bpy.types.Object]] = defaultdict(list)
@@ -0,0 +1,102 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+
+class _ArchiveHandle:
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.users = 0
+        self.lock = threading.Lock()
+
+
+class ArchiveHandlePool:
+    """LRU of open archive file descriptors shared by every VPK.
+
+    Reads are positional (os.pread), so concurrent readers never share a seek position.
+    Handles that are in use are never closed, the pool may go over max_open until they are released.
+    """
+
+    def __init__(self, max_open=32):
+        self.max_open = max_open
+        self._handles: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _acquire(self, path: Path) -> _ArchiveHandle:
+        with self._lock:
+            handle: Optional[_ArchiveHandle] = self._handles.get(path, None)
+            if handle is None:
+                flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+                handle = self._handles[path] = _ArchiveHandle(os.open(path, flags))
+            self._handles.move_to_end(path)
+            handle.users += 1
+            # Evict only after taking the handle, so the one just opened is never closed
+            self._evict()
+            return handle
+
+    def _release(self, handle: _ArchiveHandle):
+        with self._lock:
+            handle.users -= 1
+
+    def _evict(self):
+        if len(self._handles) <= self.max_open:
+            return
+        for path in list(self._handles.keys()):
+            handle = self._handles[path]
+            if handle.users == 0:
+                os.close(handle.fd)
+                del self._handles[path]
+                if len(self._handles) <= self.max_open:
+                    break
+
+    def read(self, path: Path, offset: int, size: int) -> bytes:
+        handle = self._acquire(path)
+        try:
+            chunks: List[bytes] = []
+            while size > 0:
+                chunk = self._pread(handle, size, offset)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offset += len(chunk)
+                size -= len(chunk)
+            return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+        finally:
+            self._release(handle)
+
+    if hasattr(os, 'pread'):
+        @staticmethod
+        def _pread(handle: _ArchiveHandle, size: int, offset: int) -> bytes:
+            return os.pread(handle.fd, size, offset)
+    else:
+        @staticmethod
+        def _pread(handle: _ArchiveHandle, size: int, offset: int) -> bytes:
+            # No pread on Windows, seek and read under the handle lock instead
+            with handle.lock:
+                os.lseek(handle.fd, offset, os.SEEK_SET)
+                return os.read(handle.fd, size)
+
+    def close(self, path: Optional[Path] = None):
+        with self._lock:
+            for handle_path in list(self._handles.keys()):
+                if path is not None and handle_path != path:
+                    continue
+                handle = self._handles[handle_path]
+                if handle.users == 0:
+                    os.close(handle.fd)
+                    del self._handles[handle_path]
+
+    def __len__(self):
+        return len(self._handles)
+
+
+_archive_pool: Optional[ArchiveHandlePool] = None
+
+
+def get_archive_pool() -> ArchiveHandlePool:
+    global _archive_pool
+    if _archive_pool is None:
+        _archive_pool = ArchiveHandlePool()
+    return _archive_pool
@@ -0,0 +1,320 @@
+import tempfile
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .structs.entry import Entry
+from ...bpy_utilities.logging import BPYLoggingManager
+from ...utilities.path_utilities import path_hash, packed_path_hashes
+
+log_manager = BPYLoggingManager()
+logger = log_manager.get_logger('vpk_entry_table')
+
+CACHE_VERSION = 2
+
+
+def get_cache_dir() -> Path:
+    return Path(tempfile.gettempdir()) / 'SourceIO' / 'vpk_cache'
+
+
+def _lengths_to_offsets(lengths: np.ndarray) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _gather(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenates data[start:start + length] slices, returns the packed data and offsets of each slice in it."""
+    offsets = _lengths_to_offsets(lengths)
+    index = np.repeat(np.asarray(starts, np.int64) - offsets[:-1], lengths) + np.arange(offsets[-1])
+    return data[index], offsets
+
+
+class VPKEntryTable:
+    """Columnar copy of VPK directory entries, sorted by path hash."""
+    RECORD_DTYPE = np.dtype([('crc32', '<u4'), ('preload_data_size', '<u2'), ('archive_id', '<u2'),
+                             ('offset', '<u4'), ('size', '<u4'), ('terminator', '<u2')])
+
+    def __init__(self, hashes: np.ndarray, names: np.ndarray, name_offsets: np.ndarray,
+                 crc32: np.ndarray, archive_ids: np.ndarray, offsets: np.ndarray, sizes: np.ndarray,
+                 preload_data: np.ndarray, preload_offsets: np.ndarray, preload_sizes: np.ndarray):
+        self.hashes = hashes
+        self.names = names
+        self.name_offsets = name_offsets
+        self.crc32 = crc32
+        self.archive_ids = archive_ids
+        self.offsets = offsets
+        self.sizes = sizes
+        self.preload_data = preload_data
+        self.preload_offsets = preload_offsets
+        self.preload_sizes = preload_sizes
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @classmethod
+    def from_entries(cls, entries: Dict[str, Entry]):
+        count = len(entries)
+        entry_list = list(entries.values())
+        encoded_names = [name.encode('utf8') for name in entries.keys()]
+        name_lengths = np.fromiter(map(len, encoded_names), np.int64, count)
+        preload_sizes = np.fromiter((len(entry.preload_data) for entry in entry_list), np.int64, count)
+        return cls._from_columns(np.frombuffer(b''.join(encoded_names), np.uint8), _lengths_to_offsets(name_lengths),
+                                 np.fromiter((entry.crc32 for entry in entry_list), np.uint32, count),
+                                 np.fromiter((entry.archive_id for entry in entry_list), np.uint16, count),
+                                 np.fromiter((entry.offset for entry in entry_list), np.uint32, count),
+                                 np.fromiter((entry.size for entry in entry_list), np.uint32, count),
+                                 np.frombuffer(b''.join(entry.preload_data for entry in entry_list), np.uint8),
+                                 _lengths_to_offsets(preload_sizes)[:-1], preload_sizes)
+
+    @classmethod
+    def _walk_tree(cls, tree: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finds file name terminators and (start, end, file count) of every directory and extension, one string
+        at a time."""
+        name_ends: List[int] = []
+        directories: List[Tuple[int, int, int]] = []
+        types: List[Tuple[int, int, int]] = []
+        find = tree.find
+        add_name_end = name_ends.append
+        record_size = cls.RECORD_DTYPE.itemsize
+        pos = 0
+        while True:
+            end = find(b'\x00', pos)
+            if end <= pos:
+                break
+            type_start, type_end = pos, end
+            type_first_file = len(name_ends)
+            pos = end + 1
+            while True:
+                end = find(b'\x00', pos)
+                if end <= pos:
+                    pos += 1
+                    break
+                directory_start, directory_end = pos, end
+                directory_first_file = len(name_ends)
+                pos = end + 1
+                while True:
+                    end = find(b'\x00', pos)
+                    if end <= pos:
+                        if end == -1:
+                            raise ValueError('Unexpected end of VPK directory tree')
+                        pos += 1
+                        break
+                    add_name_end(end)
+                    # skip the name terminator, the record and preload data that follows it
+                    pos = end + 1 + record_size + (tree[end + 5] | tree[end + 6] << 8)
+                directories.append((directory_start, directory_end, len(name_ends) - directory_first_file))
+            types.append((type_start, type_end, len(name_ends) - type_first_file))
+
+        return (np.array(name_ends, np.int64), np.array(directories, np.int64).reshape(-1, 3),
+                np.array(types, np.int64).reshape(-1, 3))
+
+    @classmethod
+    def _split_tree(cls, data: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Same as _walk_tree, for trees where no entry has preload data.
+
+        Records always have the same size then, so every string is found from the NUL bytes of the tree at once.
+        Returns None when the tree does not parse that way, it has to be walked instead.
+        """
+        record_size = cls.RECORD_DTYPE.itemsize
+        if len(data) <= record_size:
+            return None
+        is_nul = data == 0
+        is_ff = data == 0xFF
+        # A file name ends at a NUL followed by a record without preload data and with its 0xFFFF terminator
+        body = len(data) - record_size
+        name_ends = np.flatnonzero(is_nul[:body] & is_nul[5:body + 5] & is_nul[6:body + 6] &
+                                   is_ff[record_size - 1:-1] & is_ff[record_size:])
+        # Overlapping records mean a NUL inside some record looked like a name end
+        if len(name_ends) == 0 or np.any(np.diff(name_ends) < record_size + 2):
+            return None
+
+        # NULs inside records are data, the remaining ones end strings: file names, which are followed by a record,
+        # extension and directory names, or empty strings closing a list
+        record_marks = np.zeros(len(data) + record_size + 1, np.int8)
+        record_marks[name_ends + 1] = 1
+        record_marks[name_ends + record_size + 1] = -1
+        in_record = np.cumsum(record_marks, dtype=np.int8)[:len(data)].view(bool)
+        token_ends = np.flatnonzero(is_nul & ~in_record)
+        is_file = np.zeros(len(data), bool)
+        is_file[name_ends] = True
+        is_file = is_file[token_ends]
+        token_starts = np.empty_like(token_ends)
+        token_starts[0] = 0
+        token_starts[1:] = token_ends[:-1] + 1 + np.where(is_file[:-1], record_size, 0)
+        token_lengths = token_ends - token_starts
+        if np.any(token_lengths < 0) or np.any(token_lengths[is_file] == 0):
+            return None
+
+        # Extension and directory names open a level, empty strings close one: names at level 0 are extensions,
+        # at level 1 directories, files can only follow a directory name and the tree ends with an empty string
+        structure = ~is_file
+        structure_starts = token_starts[structure]
+        structure_ends = token_ends[structure]
+        is_name = token_lengths[structure] > 0
+        if len(is_name) == 0 or is_name[-1]:
+            return None
+        steps = np.where(is_name, 1, -1)
+        levels = np.cumsum(steps) - steps
+        if levels[-1] != 0 or np.any(levels[is_name] > 1) or np.any(levels[:-1][~is_name[:-1]] < 1):
+            return None
+        previous_structure = (np.cumsum(structure) - 1)[is_file]
+        if np.any(previous_structure < 0) or np.any((levels + steps)[previous_structure] != 2):
+            return None
+
+        # Files of a directory or extension are the ones before the next directory or extension name
+        files_before = (np.cumsum(is_file) - is_file)[structure]
+
+        def group(level: int) -> np.ndarray:
+            group_ids = np.flatnonzero(is_name & (levels == level))
+            group_ends = np.append(files_before[group_ids[1:]], len(name_ends))
+            return np.stack((structure_starts[group_ids], structure_ends[group_ids],
+                             group_ends - files_before[group_ids]), axis=1)
+
+        return name_ends, group(1), group(0)
+
+    @classmethod
+    def from_tree(cls, tree: bytes):
+        """Parses the directory tree section of a VPK (v1/v2) without creating Entry objects.
+
+        String boundaries are found in bulk when no entry has preload data, otherwise Python walks them.
+        Building full paths and decoding entry records is done in bulk.
+        """
+        data = np.frombuffer(tree, np.uint8)
+        boundaries = cls._split_tree(data)
+        if boundaries is None:
+            boundaries = cls._walk_tree(tree)
+        name_ends, directories, types = boundaries
+        record_size = cls.RECORD_DTYPE.itemsize
+
+        count = len(name_ends)
+        starts = name_ends + 1
+        records = np.ascontiguousarray(data[starts[:, None] + np.arange(record_size)]).view(cls.RECORD_DTYPE)[:, 0]
+        if np.any(records['terminator'] != 0xFFFF):
+            raise NotImplementedError('Invalid terminator')
+        preload_sizes = records['preload_data_size'].astype(np.int64)
+
+        # a file name starts where the previous entry ended, or right after its directory name
+        file_starts = np.empty(count, np.int64)
+        file_starts[1:] = starts[:-1] + record_size + preload_sizes[:-1]
+        non_empty = directories[directories[:, 2] > 0]
+        file_starts[np.cumsum(non_empty[:, 2]) - non_empty[:, 2]] = non_empty[:, 1] + 1
+
+        # full path is "{directory}/{file}.{type}", glued from 5 segments of the tree plus 2 separator bytes
+        source = np.concatenate((data, np.frombuffer(b'/.', np.uint8)))
+        segment_starts = np.empty((count, 5), np.int64)
+        segment_lengths = np.ones((count, 5), np.int64)
+        segment_starts[:, 0] = np.repeat(directories[:, 0], directories[:, 2])
+        segment_lengths[:, 0] = np.repeat(directories[:, 1] - directories[:, 0], directories[:, 2])
+        segment_starts[:, 1] = len(data)
+        segment_starts[:, 2] = file_starts
+        segment_lengths[:, 2] = starts - 1 - segment_starts[:, 2]
+        segment_starts[:, 3] = len(data) + 1
+        segment_starts[:, 4] = np.repeat(types[:, 0], types[:, 2])
+        segment_lengths[:, 4] = np.repeat(types[:, 1] - types[:, 0], types[:, 2])
+        names, segment_offsets = _gather(source, segment_starts.ravel(), segment_lengths.ravel())
+        name_offsets = segment_offsets[::5]
+
+        if np.any(names >= 0x80):
+            # Paths are latin-1, lowercase and re-encode them the slow way so they stay valid utf8
+            decoded = [names[name_offsets[i]:name_offsets[i + 1]].tobytes().decode('latin').lower().encode('utf8')
+                       for i in range(count)]
+            names = np.frombuffer(b''.join(decoded), np.uint8)
+            name_offsets = _lengths_to_offsets(np.fromiter(map(len, decoded), np.int64, count))
+        else:
+            upper = (names >= ord('A')) & (names <= ord('Z'))
+            names[upper] += ord('a') - ord('A')
+
+        preload_data, preload_offsets = _gather(data, starts + record_size, preload_sizes)
+        return cls._from_columns(names, name_offsets, records['crc32'], records['archive_id'], records['offset'],
+                                 records['size'], preload_data, preload_offsets[:-1], preload_sizes)
+
+    @classmethod
+    def _from_columns(cls, names: np.ndarray, name_offsets: np.ndarray, crc32: np.ndarray, archive_ids: np.ndarray,
+                      offsets: np.ndarray, sizes: np.ndarray, preload_data: np.ndarray, preload_offsets: np.ndarray,
+                      preload_sizes: np.ndarray):
+        hashes = packed_path_hashes(names, name_offsets)
+        order = np.argsort(hashes, kind='stable')
+        # preload data is left in place, only the offsets into it are reordered
+        sorted_names, sorted_name_offsets = _gather(names, name_offsets[:-1][order], np.diff(name_offsets)[order])
+        return cls(hashes[order],
+                   sorted_names,
+                   sorted_name_offsets.astype(np.uint64),
+                   np.asarray(crc32, np.uint32)[order],
+                   np.asarray(archive_ids, np.uint16)[order],
+                   np.asarray(offsets, np.uint32)[order],
+                   np.asarray(sizes, np.uint32)[order],
+                   preload_data,
+                   np.asarray(preload_offsets, np.uint64)[order],
+                   np.asarray(preload_sizes, np.uint16)[order])
+
+    def get_name(self, index: int) -> str:
+        return self.names[self.name_offsets[index]:self.name_offsets[index + 1]].tobytes().decode('utf8')
+
+    def find(self, full_path: str) -> int:
+        target = np.uint64(path_hash(full_path))
+        index = int(np.searchsorted(self.hashes, target))
+        while index < len(self.hashes) and self.hashes[index] == target:
+            if self.get_name(index) == full_path:
+                return index
+            index += 1
+        return -1
+
+    def get_entry(self, full_path: str) -> Optional[Entry]:
+        index = self.find(full_path)
+        if index == -1:
+            return None
+        entry = Entry(full_path, -1)
+        entry.crc32 = int(self.crc32[index])
+        entry.archive_id = int(self.archive_ids[index])
+        entry.offset = int(self.offsets[index])
+        entry.size = int(self.sizes[index])
+        entry.preload_data_size = int(self.preload_sizes[index])
+        preload_offset = int(self.preload_offsets[index])
+        entry.preload_data = self.preload_data[preload_offset:preload_offset + entry.preload_data_size].tobytes()
+        entry.loaded = True
+        return entry
+
+    @staticmethod
+    def get_cache_path(dir_path: Path) -> Path:
+        key = blake2b(str(dir_path.absolute()).encode('utf8'), digest_size=16).hexdigest()
+        return get_cache_dir() / f'{dir_path.stem}_{key}.npz'
+
+    def save(self, dir_path: Path):
+        cache_path = self.get_cache_path(dir_path)
+        stat = dir_path.stat()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with tmp_path.open('wb') as f:
+                np.savez(f, header=np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], np.int64),
+                         **self._arrays())
+            tmp_path.replace(cache_path)
+        except OSError as ex:
+            logger.warn(f'Failed to save VPK entry cache for {dir_path}: {ex}')
+
+    @classmethod
+    def load(cls, dir_path: Path) -> Optional['VPKEntryTable']:
+        cache_path = cls.get_cache_path(dir_path)
+        if not cache_path.exists():
+            return None
+        stat = dir_path.stat()
+        try:
+            with np.load(cache_path, allow_pickle=False) as data:
+                version, size, mtime = data['header'].tolist()
+                if version != CACHE_VERSION or size != stat.st_size or mtime != stat.st_mtime_ns:
+                    return None
+                return cls(**{name: data[name] for name in cls._array_names()})
+        except (OSError, ValueError, KeyError) as ex:
+            logger.warn(f'Failed to load VPK entry cache for {dir_path}: {ex}')
+            return None
+
+    @staticmethod
+    def _array_names():
+        return ('hashes', 'names', 'name_offsets', 'crc32', 'archive_ids', 'offsets', 'sizes',
+                'preload_data', 'preload_offsets', 'preload_sizes')
+
+    def _arrays(self):
+        return {name: getattr(self, name) for name in self._array_names()}
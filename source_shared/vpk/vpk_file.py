@@ -1,35 +1,44 @@
+import mmap
 from functools import lru_cache
 from io import BytesIO
 from pathlib import Path, WindowsPath
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Optional
 
+from .archive_pool import get_archive_pool
+from .entry_table import VPKEntryTable
 from .structs.entry import TitanfallEntry
 from ...utilities.byte_io_mdl import ByteIO
+from ...utilities.decompression_pool import get_decompression_pool
+from ...utilities.memory_view_io import MemoryViewIO
 from .structs import *
 from ...utilities.thirdparty.lzham.lzham import LZHAM
 
 
-def open_vpk(filepath: Union[str, Path]):
+def open_vpk(filepath: Union[str, Path], use_mmap=True):
     from struct import unpack
     with open(filepath, 'rb') as f:
         magic, version_mj, version_mn = unpack('IHH', f.read(8))
     if magic != Header.MAGIC:
         raise Exception('Not a VPK file')
     if version_mj in [1, 2] and version_mn == 0:
-        return VPKFile(filepath)
+        return VPKFile(filepath, use_mmap)
     elif version_mj == 2 and version_mn == 3:
-        return TitanfallVPKFile(filepath)
+        return TitanfallVPKFile(filepath, use_mmap)
 
 
 class VPKFile:
 
-    def __init__(self, filepath: Union[str, Path]):
+    def __init__(self, filepath: Union[str, Path], use_mmap=True, use_cache=True):
         self.filepath = Path(filepath)
-        self.reader = ByteIO(self.filepath)
+        self.reader: Optional[ByteIO] = None
+        self.use_mmap = use_mmap
+        self.use_cache = use_cache
+        self._archive_maps: Dict[int, mmap.mmap] = {}
         self.header = Header()
         self.archive_md5_entries: List[ArchiveMD5Entry] = []
 
-        self.entries = {}
+        self.entries: Dict[str, Entry] = {}
+        self.entry_table: Optional[VPKEntryTable] = None
 
         self.tree_hash = b''
         self.archive_md5_hash = b''
@@ -39,10 +48,22 @@ class VPKFile:
         self.signature = b''
 
     def read(self):
+        # Every entry is fully read here, so the directory file doesn't need to stay open afterwards
+        with self.filepath.open('rb') as f:
+            self.reader = ByteIO(f)
+            self._read()
+        self.reader = None
+
+    def _read(self):
         reader = self.reader
         self.header.read(reader)
         entry = reader.tell()
-        self.read_entries()
+        if self.use_cache:
+            self.entry_table = VPKEntryTable.load(self.filepath)
+        if self.entry_table is None:
+            self.read_entries()
+            if self.use_cache:
+                self.entry_table.save(self.filepath)
         self.reader.seek(entry + self.header.tree_size)
         if self.header.version == 2:
             reader.skip(self.header.file_data_section_size)
@@ -60,24 +81,8 @@ class VPKFile:
                 self.signature = reader.read(reader.read_int32())
 
     def read_entries(self):
-        reader = self.reader
-        while 1:
-            type_name = reader.read_ascii_string()
-            if not type_name:
-                break
-            while 1:
-                directory_name = reader.read_ascii_string()
-                if not directory_name:
-                    break
-                while 1:
-                    file_name = reader.read_ascii_string()
-                    if not file_name:
-                        break
-
-                    full_path = f'{directory_name}/{file_name}.{type_name}'.lower()
-                    self.entries[full_path] = Entry(full_path, reader.tell())
-                    _, preload_size = reader.read_fmt('IH')
-                    reader.skip(preload_size + 12)
+        # Entries are materialized lazily by find_file from the table
+        self.entry_table = VPKEntryTable.from_tree(self.reader.read(self.header.tree_size))
 
     def read_archive_md5_section(self):
         reader = self.reader
@@ -98,26 +103,101 @@ class VPKFile:
             full_path = full_path.as_posix().lower()
         else:
             full_path = Path(full_path).as_posix().lower()
-        return self.entries.get(full_path, None)
+        entry = self.entries.get(full_path, None)
+        if entry is None and self.entry_table is not None:
+            entry = self.entry_table.get_entry(full_path)
+            if entry is not None:
+                self.entries[full_path] = entry
+        return entry
 
-    def read_file(self, entry: Entry) -> BytesIO:
-        if not entry.loaded:
-            entry.read(self.reader)
+    def get_archive_path(self, archive_id):
+        return self.filepath.parent / f'{self.filepath.stem[:-3]}{archive_id:03d}.vpk'
+
+    def get_archive_view(self, archive_id) -> memoryview:
+        archive_map = self._archive_maps.get(archive_id, None)
+        if archive_map is None:
+            with open(self.get_archive_path(archive_id), 'rb') as target_archive:
+                archive_map = mmap.mmap(target_archive.fileno(), 0, access=mmap.ACCESS_READ)
+            self._archive_maps[archive_id] = archive_map
+        return memoryview(archive_map)
+
+    def close(self):
+        for archive_id, archive_map in list(self._archive_maps.items()):
+            try:
+                archive_map.close()
+            except BufferError:
+                # Some reader still holds a view into this archive, mapping will be freed with it
+                pass
+            del self._archive_maps[archive_id]
+
+    def read_files(self, entries: List[Entry], max_gap=64 * 1024) -> Dict[str, Union[BytesIO, MemoryViewIO]]:
+        """Reads a batch of entries with one sequential pass per archive, in offset order.
+
+        Entries closer than max_gap bytes to each other are fetched with a single read.
+        """
+        readers = {}
+        archive_entries: Dict[int, List[Entry]] = {}
+        for entry in entries:
+            if entry.archive_id == 0x7FFF:
+                readers[entry.file_name] = self.read_file(entry)
+            else:
+                archive_entries.setdefault(entry.archive_id, []).append(entry)
+
+        for archive_id, entries_to_read in archive_entries.items():
+            entries_to_read.sort(key=lambda e: e.offset)
+            spans = []
+            for entry in entries_to_read:
+                if spans and entry.offset - spans[-1][1] <= max_gap:
+                    spans[-1][1] = max(spans[-1][1], entry.offset + entry.size)
+                    spans[-1][2].append(entry)
+                else:
+                    spans.append([entry.offset, entry.offset + entry.size, [entry]])
+
+            if self.use_mmap:
+                archive = self.get_archive_view(archive_id)
+                archive_map = self._archive_maps[archive_id]
+                span_data = []
+                for span_start, span_end, _ in spans:
+                    if hasattr(archive_map, 'madvise') and span_end > span_start:
+                        page_start = span_start - span_start % mmap.PAGESIZE
+                        archive_map.madvise(mmap.MADV_WILLNEED, page_start, span_end - page_start)
+                    span_data.append(archive[span_start:span_end])
+            else:
+                archive_path = self.get_archive_path(archive_id)
+                archive_pool = get_archive_pool()
+                span_data = [memoryview(archive_pool.read(archive_path, span_start, span_end - span_start))
+                             for span_start, span_end, _ in spans]
+
+            for (span_start, _, span_entries), data in zip(spans, span_data):
+                for entry in span_entries:
+                    entry_data = data[entry.offset - span_start:entry.offset - span_start + entry.size]
+                    if entry.preload_data:
+                        entry_data = entry.preload_data + entry_data
+                    readers[entry.file_name] = MemoryViewIO(entry_data)
+        return readers
+
+    def read_file(self, entry: Entry) -> Union[BytesIO, MemoryViewIO]:
         if entry.archive_id == 0x7FFF:
+            if self.use_mmap:
+                return MemoryViewIO(entry.preload_data)
             reader = BytesIO(entry.preload_data)
             return reader
         else:
-            target_archive_path = self.filepath.parent / f'{self.filepath.stem[:-3]}{entry.archive_id:03d}.vpk'
+            target_archive_path = self.get_archive_path(entry.archive_id)
             print(f'Reading {entry.file_name} from {target_archive_path}')
-            with open(target_archive_path, 'rb') as target_archive:
-                target_archive.seek(entry.offset)
-                reader = BytesIO(entry.preload_data + target_archive.read(entry.size))
-                return reader
+            if self.use_mmap:
+                data = self.get_archive_view(entry.archive_id)[entry.offset:entry.offset + entry.size]
+                if entry.preload_data:
+                    return MemoryViewIO(entry.preload_data + data)
+                return MemoryViewIO(data)
+            data = get_archive_pool().read(target_archive_path, entry.offset, entry.size)
+            reader = BytesIO(entry.preload_data + data)
+            return reader
 
 
 class TitanfallVPKFile(VPKFile):
 
-    def read(self):
+    def _read(self):
         reader = self.reader
         self.header.read(reader)
         entry = reader.tell()
@@ -142,26 +222,58 @@ class TitanfallVPKFile(VPKFile):
                     entry = self.entries[full_path] = TitanfallEntry(full_path, reader.tell())
                     entry.read(reader)
 
-    def read_file(self, entry: TitanfallEntry) -> BytesIO:
-        if not entry.loaded:
-            entry.read(self.reader)
+    def get_archive_path(self, archive_id):
+        archive_name_base = self.filepath.stem[:-3]
+        archive_name_base = 'client_' + archive_name_base.split('_', 1)[-1]
+        return self.filepath.parent / f'{archive_name_base}{archive_id:03d}.vpk'
+
+    def read_file(self, entry: TitanfallEntry) -> Union[BytesIO, MemoryViewIO]:
         if entry.archive_id == 0x7FFF:
             reader = BytesIO(entry.preload_data)
             return reader
         else:
-            archive_name_base = self.filepath.stem[:-3]
-            archive_name_base = 'client_' + archive_name_base.split('_', 1)[-1]
-            target_archive_path = self.filepath.parent / f'{archive_name_base}{entry.archive_id:03d}.vpk'
+            target_archive_path = self.get_archive_path(entry.archive_id)
             print(f'Reading {entry.file_name} from {target_archive_path}')
-            with open(target_archive_path, 'rb') as target_archive:
-
-                buffer = entry.preload_data
-                for block in entry.blocks:
-                    target_archive.seek(block.offset)
-                    block_data = target_archive.read(block.compressed_size)
+            if self.use_mmap:
+                archive = self.get_archive_view(entry.archive_id)
+                if not entry.preload_data and len(entry.blocks) == 1:
+                    block = entry.blocks[0]
                     if block.compressed_size == block.uncompressed_size:
-                        buffer += block_data
-                    else:
-                        buffer += LZHAM.decompress_memory(block_data, block.uncompressed_size, 20, 1 << 0)
-                reader = BytesIO(buffer)
-                return reader
+                        return MemoryViewIO(archive[block.offset:block.offset + block.compressed_size])
+                blocks_data = [archive[block.offset:block.offset + block.compressed_size] for block in entry.blocks]
+            else:
+                archive_pool = get_archive_pool()
+                blocks_data = [archive_pool.read(target_archive_path, block.offset, block.compressed_size)
+                               for block in entry.blocks]
+
+            preload_size = len(entry.preload_data)
+            buffer = bytearray(preload_size + sum(block.uncompressed_size for block in entry.blocks))
+            buffer[:preload_size] = entry.preload_data
+            buffer_view = memoryview(buffer)
+            compressed_blocks = []
+            offset = preload_size
+            for block, block_data in zip(entry.blocks, blocks_data):
+                target = buffer_view[offset:offset + block.uncompressed_size]
+                if block.compressed_size == block.uncompressed_size:
+                    target[:] = block_data
+                else:
+                    compressed_blocks.append((bytes(block_data), target))
+                offset += block.uncompressed_size
+
+            if len(compressed_blocks) > 1:
+                # LZHAM releases the GIL, so blocks are decompressed concurrently into their slots
+                list(get_decompression_pool().map(self._decompress_block, compressed_blocks))
+            elif compressed_blocks:
+                self._decompress_block(compressed_blocks[0])
+            return MemoryViewIO(buffer)
+
+    def read_files(self, entries: List[TitanfallEntry], max_gap=64 * 1024):
+        readers = {}
+        for entry in sorted(entries, key=lambda e: (e.archive_id, e.blocks[0].offset if e.blocks else 0)):
+            readers[entry.file_name] = self.read_file(entry)
+        return readers
+
+    @staticmethod
+    def _decompress_block(block):
+        block_data, target = block
+        LZHAM.decompress_memory_into(block_data, target, 20, 1 << 0)
@@ -1,22 +1,85 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Optional
 
 from .vpk.vpk_file import open_vpk
+from ..bpy_utilities.logging import BPYLoggingManager
 from ..source_shared.vpk import VPKFile
 from ..source_shared.content_provider_base import ContentProviderBase
+from ..utilities.path_utilities import path_hashes
+
+log_manager = BPYLoggingManager()
+logger = log_manager.get_logger('vpk_content_provider')
+
+_scan_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_scan_pool() -> ThreadPoolExecutor:
+    global _scan_pool
+    if _scan_pool is None:
+        _scan_pool = ThreadPoolExecutor(min(4, os.cpu_count() or 1), thread_name_prefix='SourceIO_vpk_scan')
+    return _scan_pool
 
 
 class VPKContentProvider(ContentProviderBase):
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, load_async=False):
         super().__init__(filepath)
-        self.vpk_archive = open_vpk(filepath)
-        self.vpk_archive.read()
+        self._vpk_archive: Optional[VPKFile] = None
+        self._loading: Optional[Future] = None
+        if load_async:
+            self._loading = get_scan_pool().submit(self._load)
+        else:
+            self._load()
+
+    def _load(self):
+        vpk_archive = open_vpk(self.filepath)
+        vpk_archive.read()
+        self._vpk_archive = vpk_archive
+
+    @property
+    def is_loading(self) -> bool:
+        return self._loading is not None and not self._loading.done()
+
+    def wait_until_loaded(self):
+        if self._loading is not None and self._vpk_archive is None:
+            try:
+                self._loading.result()
+            except Exception as ex:
+                logger.error(f'Failed to read {self.filepath}: {ex}')
+            self._loading = None
+
+    def add_loaded_callback(self, callback: Callable[[], None]):
+        if self._loading is None:
+            callback()
+        else:
+            self._loading.add_done_callback(lambda _: callback())
+
+    @property
+    def vpk_archive(self) -> Optional[VPKFile]:
+        """VPK directory, blocks if it's still being read in the background. None if reading failed."""
+        self.wait_until_loaded()
+        return self._vpk_archive
 
     def find_file(self, filepath: str):
-        entry = self.vpk_archive.find_file(full_path=filepath)
+        vpk_archive = self.vpk_archive
+        if vpk_archive is None:
+            return None
+        entry = vpk_archive.find_file(full_path=filepath)
         if entry:
-            return self.vpk_archive.read_file(entry)
+            return vpk_archive.read_file(entry)
+
+    def index_files(self):
+        if self.is_loading or self.vpk_archive is None:
+            return None
+        if self.vpk_archive.entry_table is not None:
+            return self.vpk_archive.entry_table.hashes
+        return path_hashes(list(self.vpk_archive.entries.keys()))
 
     def find_path(self, filepath: str):
-        entry = self.vpk_archive.find_file(full_path=filepath)
+        vpk_archive = self.vpk_archive
+        if vpk_archive is None:
+            return None
+        entry = vpk_archive.find_file(full_path=filepath)
         if entry:
             raise NotImplementedError('Cannot get path from VPK file')
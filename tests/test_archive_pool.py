@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+# Imported directly, the addon package itself needs Blender and native libraries
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'source_shared' / 'vpk'))
+
+from archive_pool import ArchiveHandlePool
+
+
+def test_read_other_archive_while_pool_is_full_of_used_handles(tmp_path):
+    first = tmp_path / 'pak01_000.vpk'
+    second = tmp_path / 'pak01_001.vpk'
+    first.write_bytes(b'AAAAAAAA')
+    second.write_bytes(b'BBBBBBBB')
+
+    pool = ArchiveHandlePool(max_open=1)
+    held = pool._acquire(first)
+    try:
+        assert pool.read(second, 0, 4) == b'BBBB'
+        assert pool.read(first, 4, 4) == b'AAAA'
+    finally:
+        pool._release(held)
+    pool.close()
+    assert len(pool) == 0
+
+
+def test_unused_handles_are_evicted(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f'pak01_{i:03}.vpk'
+        path.write_bytes(bytes([i]) * 4)
+        paths.append(path)
+
+    pool = ArchiveHandlePool(max_open=2)
+    for i, path in enumerate(paths):
+        assert pool.read(path, 0, 4) == bytes([i]) * 4
+    assert len(pool) == 2
+    pool.close()
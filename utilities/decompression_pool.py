@@ -0,0 +1,14 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+_decompression_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_decompression_pool() -> ThreadPoolExecutor:
+    """Thread pool shared by everything that decompresses data (VPK blocks, BSP lumps)."""
+    global _decompression_pool
+    if _decompression_pool is None:
+        _decompression_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                                 thread_name_prefix='SourceIO_decompress')
+    return _decompression_pool
@@ -0,0 +1,64 @@
+import io
+from typing import Union
+
+
+class MemoryViewIO(io.RawIOBase):
+    """Read-only file-like object over a buffer (bytes, mmap, memoryview) that does not copy the underlying data."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        super().__init__()
+        self._buffer = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def writable(self):
+        return False
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            new_pos = offset
+        elif whence == io.SEEK_CUR:
+            new_pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            new_pos = len(self._buffer) + offset
+        else:
+            raise ValueError(f'Invalid whence ({whence})')
+        if new_pos < 0:
+            raise ValueError(f'Negative seek position {new_pos}')
+        self._pos = new_pos
+        return self._pos
+
+    def read(self, size=-1) -> bytes:
+        return self.read_view(size).tobytes()
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer):
+        view = self.read_view(len(buffer))
+        buffer[:len(view)] = view
+        return len(view)
+
+    def read_view(self, size=-1) -> memoryview:
+        """Same as read(), but returns a zero-copy slice of the underlying buffer."""
+        start = min(self._pos, len(self._buffer))
+        if size is None or size < 0:
+            end = len(self._buffer)
+        else:
+            end = min(start + size, len(self._buffer))
+        self._pos = end
+        return self._buffer[start:end]
+
+    def getbuffer(self) -> memoryview:
+        return self._buffer
+
+    def __len__(self):
+        return len(self._buffer)
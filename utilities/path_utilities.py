@@ -1,6 +1,12 @@
 from pathlib import Path
+from typing import List
 import os
 
+import numpy as np
+
+FNV64_OFFSET = 0xCBF29CE484222325
+FNV64_PRIME = 0x100000001B3
+
 
 def get_class_var_name(class_, var):
     a = class_.__dict__  # type: dict
@@ -140,3 +146,39 @@ def is_valid_path(path: str):
         if char in path:
             return False
     return True
+
+
+def path_hash(path: str) -> int:
+    """64-bit FNV-1a of utf8 encoded path, same as path_hashes() for a single path."""
+    value = FNV64_OFFSET
+    for byte in path.encode('utf8'):
+        value = ((value ^ byte) * FNV64_PRIME) & 0xFFFFFFFFFFFFFFFF
+    return value
+
+
+def path_hashes(paths: List[str]) -> np.ndarray:
+    encoded = [path.encode('utf8') for path in paths]
+    offsets = np.zeros(len(encoded) + 1, np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), np.int64, len(encoded)), out=offsets[1:])
+    return packed_path_hashes(np.frombuffer(b''.join(encoded), np.uint8), offsets)
+
+
+def packed_path_hashes(blob: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """path_hash of every name packed in blob, name i being blob[offsets[i]:offsets[i + 1]]."""
+    starts = offsets[:-1].astype(np.int64)
+    lengths = np.diff(offsets).astype(np.int64)
+    # longest names first, so names still being hashed at column i are always a prefix
+    order = np.argsort(-lengths, kind='stable')
+    starts = starts[order]
+    lengths = lengths[order]
+    hashes = np.full(len(lengths), FNV64_OFFSET, np.uint64)
+    prime = np.uint64(FNV64_PRIME)
+    max_length = int(lengths[0]) if len(lengths) else 0
+    active_counts = np.searchsorted(-lengths, -np.arange(max_length), 'left')
+    for column, count in enumerate(active_counts):
+        active = hashes[:count]
+        active ^= blob[starts[:count] + column]
+        active *= prime
+    result = np.empty_like(hashes)
+    result[order] = hashes
+    return result
@@ -132,3 +132,24 @@ class LZHAM(metaclass=SingletonMeta):
             return pointer_to_array(decompressed_ptr, decompressed_size_ptr.contents.value).contents
         else:
             raise Exception(f'LZHAM decompression error: {result.name}')
+
+    @classmethod
+    def decompress_memory_into(cls, compressed_data, destination, dict_size=15, flags=0):
+        """Decompresses straight into a writable buffer (bytearray or a memoryview slice of one)."""
+        compressed_size = len(compressed_data)
+        compressed_ptr = create_string_buffer(compressed_data)
+        decompressed_size = len(destination)
+        decompressed_ptr = (ctypes.c_char * decompressed_size).from_buffer(destination)
+        compressed_size_ptr = pointer(c_uint32(compressed_size))
+        decompressed_size_ptr = pointer(c_uint32(decompressed_size))
+        decompressed_params = DecompressionParameters()
+        decompressed_params.m_dict_size_log2 = dict_size
+        decompressed_params.m_decompress_flags = flags
+        adler_prt = pointer(c_uint32(0))
+        result = cls._decompress_memory(decompressed_params,
+                                        decompressed_ptr, decompressed_size_ptr,
+                                        compressed_ptr, compressed_size_ptr,
+                                        adler_prt)
+        if result != DecompressStatus.Success:
+            raise Exception(f'LZHAM decompression error: {result.name}')
+        return decompressed_size_ptr.contents.value